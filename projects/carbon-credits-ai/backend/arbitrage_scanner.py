@@ -0,0 +1,140 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Arbitrage Scanner
+Vectorized cross-chain arbitrage detection over a tokens x chains price matrix
+"""
+
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+
+
+class ArbitrageScanner:
+    """Finds buy-on-one-chain, sell-on-another opportunities for many tokens at once
+
+    Prices live in a (tokens, chains) matrix and gas costs in a (chains,)
+    vector. A scan first bounds each token's best profit from its cheapest and
+    dearest chain and drops tokens that cannot clear the floors. For the rest
+    it computes the price ratio of every (buy chain, sell chain) pair as one
+    (tokens, chains, chains) array in preallocated buffers, nets out the gas
+    of both legs, and picks the top opportunities with argpartition, so no
+    Python code runs per token or per chain.
+    """
+
+    def __init__(
+        self,
+        tokens: Sequence[str],
+        chains: Sequence[str],
+        base_prices: Sequence[float],
+        trade_amount: float = 10000,
+        dislocation_rate: float = 0.3,
+        max_deviation: float = 0.02,
+        gas_range: tuple = (25, 100),
+        seed: Optional[int] = None
+    ):
+        self.tokens = np.asarray(tokens)
+        self.chains = np.asarray(chains)
+        self.base_prices = np.asarray(base_prices, dtype=float)
+        self.trade_amount = trade_amount
+        self.dislocation_rate = dislocation_rate
+        self.max_deviation = max_deviation
+        self.gas_range = gas_range
+        self.rng = np.random.default_rng(seed)
+
+        shape = (len(self.tokens), len(self.chains))
+        self.prices = np.repeat(self.base_prices[:, None], shape[1], axis=1)
+        self.gas = np.full(shape[1], float(np.mean(gas_range)))
+        self._ratios = np.empty((*shape, shape[1]))
+        self._net = np.empty_like(self._ratios)
+
+    def update(self, prices: np.ndarray, gas: Optional[np.ndarray] = None):
+        """Replace the price matrix, and optionally the per-chain gas cost of one leg"""
+        prices = np.asarray(prices, dtype=float)
+        if prices.shape != self.prices.shape:
+            raise ValueError(f"Expected prices of shape {self.prices.shape}, got {prices.shape}")
+        self.prices[...] = prices
+        if gas is not None:
+            self.gas[...] = gas
+
+    def tick(self):
+        """Simulate one market tick: some tokens drift apart across chains, gas moves"""
+        tokens, chains = self.prices.shape
+        dislocated = self.rng.random(tokens) < self.dislocation_rate
+        noise = self.rng.uniform(-self.max_deviation, self.max_deviation, (tokens, chains))
+        np.multiply(self.base_prices[:, None], 1 + noise * dislocated[:, None], out=self.prices)
+        self.gas[...] = self.rng.uniform(*self.gas_range, chains)
+
+    def scan(
+        self,
+        top_k: int = 10,
+        min_spread_pct: float = 1.0,
+        min_net_profit: float = 100,
+        best_per_token: bool = True
+    ) -> List[Dict]:
+        """Most profitable opportunities after gas, best first
+
+        With best_per_token only each token's best chain pair is reported;
+        otherwise every qualifying pair competes for the top k.
+        """
+        tokens, chains = self.prices.shape
+        if not tokens or chains < 2:
+            return []
+
+        # Upper bound per token from its cheapest and dearest chain; only tokens that could clear
+        # the profit and spread floors get the full pairwise pass
+        prices = self.prices
+        best_ratio = prices.max(axis=1) / prices.min(axis=1)
+        min_ratio = 1 + min_spread_pct / 100
+        cheapest_legs = 2 * self.gas.min()
+        hot = np.flatnonzero(
+            (self.trade_amount * (best_ratio - 1) - cheapest_legs > min_net_profit) & (best_ratio > min_ratio)
+        )
+        count = len(hot)
+        if not count:
+            return []
+        hot_prices = prices[hot]
+
+        # ratios[t, i, j] = price on sell chain j over price on buy chain i
+        ratios = self._ratios[:count]
+        np.divide(hot_prices[:, None, :], hot_prices[:, :, None], out=ratios)
+
+        # net = amount * (ratio - 1) - gas of both legs
+        net = self._net[:count]
+        np.multiply(ratios, self.trade_amount, out=net)
+        net -= (self.trade_amount + self.gas[:, None] + self.gas[None, :])[None]
+
+        # The spread floor only needs its own pass when the profit floor does not already imply it
+        if self.trade_amount * (min_ratio - 1) > min_net_profit + cheapest_legs:
+            np.putmask(net, ratios <= min_ratio, -np.inf)
+
+        flat = net.reshape(count, -1)
+        if best_per_token:
+            pair = np.argmax(flat, axis=1)
+            candidates = np.arange(count) * chains * chains + pair
+        else:
+            candidates = np.arange(flat.size)
+        values = net.ravel()[candidates]
+
+        qualifying = np.flatnonzero(values > min_net_profit)
+        if len(qualifying) > top_k:
+            qualifying = qualifying[np.argpartition(-values[qualifying], top_k - 1)[:top_k]]
+        qualifying = qualifying[np.argsort(-values[qualifying], kind="stable")]
+
+        row, buy_index, sell_index = np.unravel_index(candidates[qualifying], net.shape)
+        token_index = hot[row]
+        spread_pct = (ratios[row, buy_index, sell_index] - 1) * 100
+        gas_cost = self.gas[buy_index] + self.gas[sell_index]
+        profit = self.trade_amount * spread_pct / 100
+
+        return [
+            {
+                "token": str(self.tokens[t]),
+                "chain_a": str(self.chains[i]),
+                "chain_b": str(self.chains[j]),
+                "price_diff": float(diff),
+                "profit_potential": float(potential),
+                "gas_cost": float(gas),
+                "net_profit": float(potential - gas)
+            }
+            for t, i, j, diff, potential, gas in zip(token_index, buy_index, sell_index, spread_pct, profit, gas_cost)
+        ]
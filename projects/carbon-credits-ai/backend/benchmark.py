@@ -0,0 +1,157 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Benchmarks
+Micro-benchmarks for the hot paths of the trading backend
+
+Usage: python benchmark.py <benchmark> [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+def _timeit(fn, repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _order_flow(count: int, listings: int, seed: int = 0):
+    """Random limit, market and cancel messages around a price of 100"""
+    rng = np.random.default_rng(seed)
+    kinds = rng.choice(["limit", "market", "cancel"], size=count, p=[0.7, 0.1, 0.2]).tolist()
+    listing = [f"CC_{i:03d}" for i in rng.integers(0, listings, count)]
+    sides = rng.choice(["buy", "sell"], size=count).tolist()
+    # Buys mostly below 100 and sells mostly above, so the books build depth and cross at the margin
+    offsets = np.round(rng.normal(1.0, 1.5, count), 2)
+    prices = np.where(np.array(sides) == "buy", 100 - offsets, 100 + offsets).tolist()
+    quantities = rng.integers(1, 200, count).tolist()
+    picks = rng.random(count).tolist()
+    return list(zip(kinds, listing, sides, prices, quantities, picks))
+
+
+def _replay(engine, flow) -> int:
+    open_ids = []
+    fills = 0
+    for kind, listing, side, price, quantity, pick in flow:
+        if kind == "cancel":
+            if open_ids:
+                index = int(pick * len(open_ids))
+                open_ids[index], open_ids[-1] = open_ids[-1], open_ids[index]
+                order_id = open_ids.pop()
+                if engine.order(order_id) is not None:
+                    engine.cancel(order_id)
+            continue
+        result = engine.submit(listing, side, quantity, "bench", price=price if kind == "limit" else None)
+        fills += len(result["fills"])
+        if result["order"].remaining:
+            open_ids.append(result["order"].order_id)
+    return fills
+
+
+def _check_book(engine):
+    """Every level's quantity equals its open orders, and neither side crosses"""
+    for book in engine.books.values():
+        for side in ("buy", "sell"):
+            levels = book._levels[side]
+            assert sorted(levels) == book._keys[side]
+            for level in levels.values():
+                assert level.quantity == sum(order.remaining for order in level.orders) > 0
+        bid, ask = book.best("buy"), book.best("sell")
+        assert bid is None or ask is None or bid < ask
+
+
+def bench_order_book(repeat: int):
+    """Matching engine throughput on mixed limit, market and cancel flow"""
+    from order_book import MatchingEngine
+
+    count = 200_000
+    flow = _order_flow(count, listings=50)
+
+    engine = MatchingEngine()
+    fills = _replay(engine, flow)
+    _check_book(engine)
+
+    elapsed = _timeit(lambda: _replay(MatchingEngine(), flow), repeat)
+    print(f"order book ({count} messages, 50 listings, {fills} fills)")
+    print(f"  elapsed:    {elapsed * 1000:10.2f} ms")
+    print(f"  throughput: {count / elapsed:10.0f} messages/s")
+    print(f"  latency:    {elapsed / count * 1e6:10.2f} us/message")
+
+
+def _market_batches(seed: int = 0):
+    """Daily market rows appended in batches, with weekend-style and multi-day gaps and a late row"""
+    rng = np.random.default_rng(seed)
+    days = np.arange("2023-01-01", "2024-01-01", dtype="datetime64[D]")
+    # Drop weekends and a two-week outage so windows span days without data
+    days = days[(days.astype("datetime64[D]").view("int64") - 4) % 7 < 5]
+    days = days[(days < np.datetime64("2023-06-01")) | (days >= np.datetime64("2023-06-15"))]
+    batches = [days[:200]]
+    batches += [days[i:i + 1] for i in range(200, len(days))]
+    batches += [np.array(["2024-01-10"], dtype="datetime64[D]"), np.array(["2023-12-28"], dtype="datetime64[D]")]
+    return [(batch, rng.uniform(5, 50, len(batch)), rng.integers(100, 1000, len(batch))) for batch in batches]
+
+
+def _check_analytics(analytics, frame):
+    """Every window agrees with a pandas computation over the same calendar days"""
+    import pandas as pd
+
+    last = frame["date"].max()
+    for window, length in analytics.windows.items():
+        rows = frame[frame["date"] > last - pd.Timedelta(days=length)]
+        snapshot = analytics.snapshot(window)
+        assert snapshot["samples"] == len(rows), (window, snapshot["samples"], len(rows))
+        assert snapshot["total_volume"] == int(rows["volume"].sum())
+        assert np.isclose(snapshot["average_price"], rows["price"].mean())
+        # pandas leaves the std of a single row undefined; the analytics report 0
+        assert np.isclose(snapshot["price_volatility"], rows["price"].std() if len(rows) > 1 else 0.0)
+
+
+def bench_market_analytics(repeat: int):
+    """Market analytics append and read cost, checked against pandas after every batch"""
+    import pandas as pd
+
+    from market_analytics import MarketAnalytics
+
+    batches = _market_batches()
+    analytics = MarketAnalytics()
+    frames = []
+    for dates, prices, volumes in batches:
+        analytics.update(dates, prices, volumes)
+        frames.append(pd.DataFrame({"date": pd.to_datetime(dates), "price": prices, "volume": volumes}))
+        _check_analytics(analytics, pd.concat(frames))
+
+    def replay():
+        fresh = MarketAnalytics()
+        for dates, prices, volumes in batches:
+            fresh.update(dates, prices, volumes)
+
+    elapsed = _timeit(replay, repeat)
+    reads = 100_000
+    read_elapsed = _timeit(lambda: [analytics.snapshot("30d") for _ in range(reads)], repeat)
+    print(f"market analytics ({len(batches)} appends, {sum(len(b[0]) for b in batches)} rows)")
+    print(f"  append:     {elapsed / len(batches) * 1e6:10.2f} us/batch")
+    print(f"  read:       {read_elapsed / reads * 1e6:10.2f} us/snapshot")
+
+
+BENCHMARKS = {
+    "order-book": bench_order_book,
+    "market-analytics": bench_market_analytics,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="CarbonCredits AI benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = sorted(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    for name in names:
+        BENCHMARKS[name](args.repeat)
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Compute Executor
+Runs blocking model and optimization work off the asyncio event loop
+"""
+
+import asyncio
+import functools
+import logging
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class ComputeExecutor:
+    """Bounded thread or process pool with per-call timeouts
+
+    Predictions and portfolio solves hold a slot from submission until the
+    pool is done with them: `max_workers` slots execute and `max_queue_depth`
+    more wait, and a request finding every slot taken gets a 503. A request
+    whose call outlasts its timeout gets a 504. If that happens (or the
+    client disconnects) while the call is still waiting for a worker it is
+    cancelled and its slot freed; a call that already started cannot be
+    stopped and keeps its slot until it returns, so the bound counts the
+    work actually occupying the pool. Long-running work should therefore
+    bound itself too, as the portfolio optimizer does with its time limit.
+
+    A process pool sidesteps the GIL for pure-Python work such as the
+    optimizer's branch and bound, but `fn` and its arguments must then be
+    picklable. Where fork is available, all workers are forked when the pool
+    is created, from the main thread and before the server starts its own
+    threads, so they neither re-run the app module nor inherit held locks.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        kind: Optional[str] = None,
+        max_workers: Optional[int] = None,
+        max_queue_depth: Optional[int] = None,
+        timeout: Optional[float] = None
+    ):
+        prefix = f"CARBON_{name.upper()}"
+        self.name = name
+        self.kind = kind or os.environ.get(f"{prefix}_EXECUTOR", "thread")
+        self.max_workers = max_workers or int(os.environ.get(f"{prefix}_WORKERS", 2))
+        self.max_queue_depth = max_queue_depth if max_queue_depth is not None else int(
+            os.environ.get(f"{prefix}_QUEUE_DEPTH", 32)
+        )
+        self.timeout = timeout if timeout is not None else float(os.environ.get(f"{prefix}_TIMEOUT_SECONDS", 10))
+
+        if self.kind == "process":
+            method = "fork" if "fork" in multiprocessing.get_all_start_methods() else "spawn"
+            self._pool: Executor = ProcessPoolExecutor(
+                max_workers=self.max_workers, mp_context=multiprocessing.get_context(method)
+            )
+            # Forked pools start every worker on the first submit; do that now
+            self._pool.submit(os.getpid).result()
+        elif self.kind == "thread":
+            self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix=name)
+        else:
+            raise ValueError(f"Unknown executor kind {self.kind}, expected thread or process")
+
+        # Slots are taken on the event loop and given back from pool callbacks
+        self._slots_lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.rejected = 0
+        self.timed_out = 0
+        self.cancelled = 0
+
+    async def run(self, fn: Callable, *args, timeout: Optional[float] = None, **kwargs):
+        """Run `fn` on the pool and wait for it, up to the timeout"""
+        with self._slots_lock:
+            if self._in_flight >= self.max_workers + self.max_queue_depth:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail=f"{self.name.capitalize()} capacity exhausted, retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            self._in_flight += 1
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            self._release(None)
+            raise
+        # The pool future, not the awaiting request, decides when the slot is free
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wait_for(asyncio.wrap_future(future), timeout or self.timeout)
+        except asyncio.TimeoutError:
+            self.timed_out += 1
+            self._cancel(future)
+            raise HTTPException(status_code=504, detail=f"{self.name.capitalize()} timed out")
+        except asyncio.CancelledError:
+            self._cancel(future)
+            raise
+
+    def _release(self, future):
+        with self._slots_lock:
+            self._in_flight -= 1
+            if future is not None and not future.cancelled():
+                self.completed += 1
+
+    def _cancel(self, future):
+        if future.cancel():
+            with self._slots_lock:
+                self.cancelled += 1
+
+    def stats(self) -> Dict:
+        """Current load of the executor"""
+        return {
+            "kind": self.kind,
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "timeout_seconds": self.timeout,
+            "in_flight": self._in_flight,
+            "queued": max(self._in_flight - self.max_workers, 0),
+            "completed": self.completed,
+            "rejected": self.rejected,
+            "timed_out": self.timed_out,
+            "cancelled": self.cancelled
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
@@ -0,0 +1,491 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Credit Inventory
+Columnar store of listed carbon credits
+"""
+
+import base64
+import json
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sequence, Tuple
+
+import numpy as np
+
+CATEGORICAL_FIELDS = ("type", "certification", "location")
+NUMERIC_FIELDS = {
+    "price": np.float64,
+    "volume": np.int64,
+    "co2_tons": np.float64,
+    "timestamp": "datetime64[us]"
+}
+FIELDS = ("id", "type", "price", "volume", "location", "certification", "co2_tons", "timestamp")
+SORT_FIELDS = ("id", "price", "volume", "co2_tons", "timestamp")
+
+# Distinct cached results kept before the cache is cleared
+MAX_CACHED = 256
+
+
+def encode_cursor(key, credit_id: str) -> str:
+    """Opaque keyset cursor for the position after (sort key, id)"""
+    return base64.urlsafe_b64encode(json.dumps([key, credit_id]).encode()).decode()
+
+
+def decode_cursor(cursor: str) -> Tuple[object, str]:
+    try:
+        key, credit_id = json.loads(base64.urlsafe_b64decode(cursor.encode()))
+    except (ValueError, TypeError) as e:
+        raise ValueError("Malformed cursor") from e
+    return key, credit_id
+
+
+class CreditInventory:
+    """Carbon credits as NumPy columns, one row per listing
+
+    Prices, volumes, tons and timestamps are typed columns, and type,
+    certification and location are small integer codes into per-field
+    category lists, so a listing costs a few dozen bytes plus its id instead
+    of a model object with a dict of boxed values. Columns grow by doubling.
+    Delisted rows are only marked and are compacted away once they make up
+    half the rows, so listing order is preserved.
+
+    The inventory is the source of truth: credits come out as `model`
+    instances (plain dicts by default) built only for the rows asked for,
+    and changes go through `add`, `update`, `set` and `remove`. Every change
+    bumps `version`, which keys `cached` results such as pre-serialized
+    responses. The query methods mirror `CreditRepository`.
+
+    `query` serves filtered, sorted pages with keyset cursors. Each sort
+    field has an index of the listed rows ordered by (value, id), built on
+    first use and rebuilt only after that field or the set of listings
+    changed; a page is two binary searches into it plus a scan of just
+    enough rows to fill the page. With a price range on another sort field
+    that scan would visit about limit * n / k rows to find a page among the
+    k rows in range, so a narrow range instead takes its k rows from the
+    price index and orders them by their place in the sort index. Either
+    way a page costs O(min(limit * n / k, k log k)): it follows the page size
+    unless a selective price filter is combined with another sort.
+
+    `find` and `price_range` use indexes built the same way: each
+    categorical field keeps the listed rows per category code, and a price
+    range is a slice of the price sort index.
+    """
+
+    def __init__(
+        self,
+        credits: Iterable = (),
+        model: Callable[..., object] = dict,
+        field: Callable[[object, str], object] = getattr,
+        capacity: int = 1024
+    ):
+        self.model = model
+        self.field = field
+        self.version = 0
+        self.categories: Dict[str, list] = {name: [] for name in CATEGORICAL_FIELDS}
+        self._category_codes: Dict[str, Dict[str, int]] = {name: {} for name in CATEGORICAL_FIELDS}
+        self._columns: Dict[str, np.ndarray] = {
+            "id": np.empty(capacity, dtype=object),
+            "alive": np.zeros(capacity, dtype=bool),
+            **{name: np.empty(capacity, dtype=np.int16) for name in CATEGORICAL_FIELDS},
+            **{name: np.empty(capacity, dtype=dtype) for name, dtype in NUMERIC_FIELDS.items()}
+        }
+        self._rows: Dict[str, int] = {}
+        self._size = 0
+        self._cache: Dict[str, tuple] = {}
+        # Change counters per field and for the set of listed rows, and the sort indexes built from them
+        self._versions: Dict[str, int] = {name: 0 for name in ("rows",) + FIELDS}
+        self._sort_indexes: Dict[str, tuple] = {}
+        self._category_indexes: Dict[str, tuple] = {}
+        self._sort_positions: Dict[str, tuple] = {}
+
+        self.extend(credits)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def __iter__(self) -> Iterator:
+        return iter(self.all())
+
+    def __contains__(self, credit_id: str) -> bool:
+        return credit_id in self._rows
+
+    def column(self, name: str) -> np.ndarray:
+        """Values of one field for every listed credit, in listing order; categorical fields as codes"""
+        return self._columns[name][:self._size][self._alive_rows()]
+
+    def _alive_rows(self) -> np.ndarray:
+        return np.flatnonzero(self._columns["alive"][:self._size])
+
+    def _code(self, name: str, value: str) -> int:
+        codes = self._category_codes[name]
+        if value not in codes:
+            codes[value] = len(self.categories[name])
+            self.categories[name].append(value)
+        return codes[value]
+
+    def _reserve(self, count: int):
+        capacity = len(self._columns["id"])
+        if self._size + count <= capacity:
+            return
+        while capacity < self._size + count:
+            capacity *= 2
+        for name, column in self._columns.items():
+            grown = np.zeros(capacity, dtype=column.dtype) if name == "alive" else np.empty(capacity, dtype=column.dtype)
+            grown[:self._size] = column[:self._size]
+            self._columns[name] = grown
+
+    def _changed(self, *names: str):
+        self.version += 1
+        self._cache.clear()
+        for name in names:
+            self._versions[name] += 1
+
+    def _write(self, row: int, values: Dict):
+        columns = self._columns
+        for name, value in values.items():
+            self._versions[name] += 1
+            if name in self._category_codes:
+                value = self._code(name, value)
+            columns[name][row] = value
+
+    def add(self, credit):
+        """List a credit; a credit with the same id is replaced in its place"""
+        self.extend((credit,))
+
+    def extend(self, credits: Iterable):
+        """List many credits, filling the columns in one pass per field"""
+        pending: Dict[str, list] = {name: [] for name in FIELDS}
+        pending_index: Dict[str, int] = {}
+        for credit in credits:
+            values = {name: self.field(credit, name) for name in FIELDS}
+            credit_id = values["id"]
+            row = self._rows.get(credit_id)
+            if row is not None:
+                self._write(row, values)
+            elif credit_id in pending_index:
+                # Repeated within the batch: the last one wins, at the first one's position
+                for name, value in values.items():
+                    pending[name][pending_index[credit_id]] = value
+            else:
+                pending_index[credit_id] = len(pending["id"])
+                for name, value in values.items():
+                    pending[name].append(value)
+
+        count = len(pending["id"])
+        if count:
+            self._reserve(count)
+            rows = slice(self._size, self._size + count)
+            columns = self._columns
+            for name in FIELDS:
+                if name in self._category_codes:
+                    columns[name][rows] = [self._code(name, value) for value in pending[name]]
+                else:
+                    columns[name][rows] = pending[name]
+            columns["alive"][rows] = True
+            self._rows.update(zip(pending["id"], range(self._size, self._size + count)))
+            self._size += count
+            self._changed("rows")
+        else:
+            self._changed()
+
+    def update(self, credit):
+        """Overwrite a listed credit with new values for all of its fields"""
+        credit_id = self.field(credit, "id")
+        if credit_id not in self._rows:
+            raise KeyError(credit_id)
+        self.add(credit)
+
+    def set(self, credit_id: str, **values):
+        """Change some fields of a listed credit, e.g. set(credit_id, volume=120)"""
+        unknown = set(values) - set(FIELDS[1:])
+        if unknown:
+            raise ValueError(f"Unknown credit fields {', '.join(sorted(unknown))}")
+        row = self._rows[credit_id]
+        # Move the row within current sort indexes instead of rebuilding them
+        current = [name for name in values if name in self._sort_indexes and self._index_current(name)]
+        old_keys = {name: self._sort_keys(name, self._columns[name][row:row + 1])[0] for name in current}
+        self._write(row, values)
+        for name in current:
+            self._reposition(name, row, credit_id, old_keys[name])
+        self._changed()
+
+    def remove(self, credit_id: str) -> Optional[object]:
+        """Delist a credit and return it, or None if it is not listed"""
+        row = self._rows.pop(credit_id, None)
+        if row is None:
+            return None
+        credit = self._materialize(np.array([row]))[0]
+        self._columns["alive"][row] = False
+        self._columns["id"][row] = None
+        if self._size > 64 and len(self._rows) < self._size // 2:
+            self._compact()
+        self._changed("rows")
+        return credit
+
+    def _compact(self):
+        alive = self._alive_rows()
+        for column in self._columns.values():
+            column[:len(alive)] = column[alive]
+        self._columns["alive"][len(alive):self._size] = False
+        self._size = len(alive)
+        self._rows = dict(zip(self._columns["id"][:self._size].tolist(), range(self._size)))
+
+    def records(self, rows: np.ndarray, fields: Iterable[str] = FIELDS) -> List[Dict]:
+        """Plain field dicts for the given rows, categories decoded"""
+        data = {}
+        for name in fields:
+            values = self._columns[name][rows]
+            if name in self._category_codes:
+                data[name] = np.asarray(self.categories[name], dtype=object)[values].tolist() if len(values) else []
+            else:
+                data[name] = values.tolist()
+        names = list(data)
+        return [dict(zip(names, row)) for row in zip(*data.values())]
+
+    def _materialize(self, rows: np.ndarray) -> List:
+        return [self.model(**record) for record in self.records(rows)]
+
+    def get(self, credit_id: str) -> Optional[object]:
+        """Credit with the given id, or None"""
+        row = self._rows.get(credit_id)
+        if row is None:
+            return None
+        return self._materialize(np.array([row]))[0]
+
+    def all(self) -> List:
+        """Every credit in listing order"""
+        return self._materialize(self._alive_rows())
+
+    def cached(self, key: str, build: Callable[["CreditInventory"], object]):
+        """Result of build(self), reused until the inventory next changes"""
+        entry = self._cache.get(key)
+        if entry is None:
+            if len(self._cache) >= MAX_CACHED:
+                self._cache.clear()
+            entry = self._cache[key] = (build(self),)
+        return entry[0]
+
+    def values(self, name: str) -> List:
+        """Distinct values of a categorical field among listed credits"""
+        codes = np.unique(self.column(name))
+        return [self.categories[name][code] for code in codes.tolist()]
+
+    def count(self, name: str, value) -> int:
+        """Number of credits whose categorical field has the given value"""
+        code = self._category_codes[name].get(value)
+        if code is None:
+            return 0
+        return len(self._category_index(name).get(code, ()))
+
+    def _category_index(self, name: str) -> Dict[int, np.ndarray]:
+        """Listed rows of each category code of a field, in listing order"""
+        versions = (self._versions["rows"], self._versions[name])
+        index = self._category_indexes.get(name)
+        if index is None or index[0] != versions:
+            rows = self._alive_rows()
+            codes = self._columns[name][rows]
+            order = np.argsort(codes, kind="stable")
+            present, starts = np.unique(codes[order], return_index=True)
+            groups = np.split(rows[order], starts[1:])
+            index = self._category_indexes[name] = (versions, dict(zip(present.tolist(), groups)))
+        return index[1]
+
+    def _matching_rows(self, criteria: Dict) -> np.ndarray:
+        accepted_codes = {}
+        for name, accepted in criteria.items():
+            if name not in self._category_codes:
+                raise ValueError(f"{name} is not categorical, expected one of {', '.join(CATEGORICAL_FIELDS)}")
+            if not isinstance(accepted, (list, tuple, set, frozenset)):
+                accepted = (accepted,)
+            codes = self._category_codes[name]
+            accepted_codes[name] = [codes[value] for value in accepted if value in codes]
+        if not accepted_codes:
+            return self._alive_rows()
+
+        # Start from the indexed rows of one criterion and check the others on just those rows
+        name, codes = next(iter(accepted_codes.items()))
+        index = self._category_index(name)
+        groups = [index[code] for code in codes if code in index]
+        rows = np.sort(np.concatenate(groups)) if groups else np.empty(0, dtype=np.int64)
+        for name, codes in list(accepted_codes.items())[1:]:
+            rows = rows[np.isin(self._columns[name][rows], codes)]
+        return rows
+
+    def find(self, **criteria) -> List:
+        """Credits matching every criterion, in listing order
+
+        Each keyword names a categorical field and gives either one value or
+        a list, tuple or set of accepted values, e.g. find(type=["forest", "ocean"]).
+        """
+        return self._materialize(self._matching_rows(criteria))
+
+    def price_range(self, low: Optional[float] = None, high: Optional[float] = None) -> List:
+        """Credits priced within [low, high], cheapest first and equal prices by id"""
+        return self._materialize(self._sort_index("price")[0][slice(*self._price_bounds(low, high))])
+
+    def _price_bounds(self, low: Optional[float], high: Optional[float]) -> Tuple[int, int]:
+        """Start and stop of the price index entries priced within [low, high]"""
+        rows, keys, _ = self._sort_index("price")
+        start = 0 if low is None else int(np.searchsorted(keys, low, side="left"))
+        stop = len(rows) if high is None else int(np.searchsorted(keys, high, side="right"))
+        return start, stop
+
+    def _index_versions(self, name: str) -> tuple:
+        return self._versions["rows"], self._versions["id"], self._versions[name]
+
+    def _index_current(self, name: str) -> bool:
+        index = self._sort_indexes.get(name)
+        return index is not None and index[0] == self._index_versions(name)
+
+    def _reposition(self, name: str, row: int, credit_id: str, old_key):
+        """Shift the entries between a row's old and new place in a sort index by one"""
+        _, rows, keys, ids = self._sort_indexes[name]
+        old = self._position(keys, ids, old_key, credit_id, "left")
+        key = self._sort_keys(name, self._columns[name][row:row + 1])[0]
+        new = self._position(keys, ids, key, credit_id, "left")
+        if new > old:
+            # Insertion point counted the row's own old entry
+            new -= 1
+            for array in (rows, keys, ids):
+                array[old:new] = array[old + 1:new + 1]
+        elif new < old:
+            for array in (rows, keys, ids):
+                array[new + 1:old + 1] = array[new:old]
+        rows[new], keys[new], ids[new] = row, key, credit_id
+        self._sort_indexes[name] = (self._index_versions(name), rows, keys, ids)
+
+    def _sort_index(self, name: str) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        """Listed rows ordered by (field value, id), with their keys and ids in that order"""
+        versions = self._index_versions(name)
+        index = self._sort_indexes.get(name)
+        if index is None or index[0] != versions:
+            rows = self._alive_rows()
+            ids = np.array(self._columns["id"][rows].tolist(), dtype=str)
+            keys = ids if name == "id" else self._sort_keys(name, self._columns[name][rows])
+            order = np.lexsort((ids, keys))
+            index = self._sort_indexes[name] = (versions, rows[order], keys[order], ids[order])
+        return index[1:]
+
+    def _positions(self, name: str) -> np.ndarray:
+        """Place of each row in a field's sort index, indexed by row"""
+        rows = self._sort_index(name)[0]
+        versions = self._sort_indexes[name][0]
+        positions = self._sort_positions.get(name)
+        if positions is None or positions[0] != versions:
+            inverse = np.full(self._size, -1, dtype=np.int64)
+            inverse[rows] = np.arange(len(rows))
+            positions = self._sort_positions[name] = (versions, inverse)
+        return positions[1]
+
+    @staticmethod
+    def _sort_keys(name: str, values: np.ndarray) -> np.ndarray:
+        # Timestamps sort and appear in cursors as integer microseconds
+        return values.view(np.int64) if name == "timestamp" else values
+
+    @staticmethod
+    def _position(keys: np.ndarray, ids: np.ndarray, key, credit_id: str, side: str) -> int:
+        """Insertion point of (key, id) in an index ordered by (key, id)"""
+        low = int(np.searchsorted(keys, key, side="left"))
+        high = int(np.searchsorted(keys, key, side="right"))
+        return low + int(np.searchsorted(ids[low:high], credit_id, side=side))
+
+    def query(
+        self,
+        limit: int = 50,
+        cursor: Optional[str] = None,
+        sort: str = "id",
+        descending: bool = False,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None,
+        fields: Optional[Sequence[str]] = None,
+        **criteria
+    ) -> Dict:
+        """One page of credits matching the filters, in (sort field, id) order
+
+        Categorical criteria work as in `find`. `fields` projects each credit
+        onto a subset of its fields. Pass the returned `next_cursor` back with
+        the same filters and sort to get the following page; it is None once
+        a page comes back short. Credits come back as plain dicts.
+        """
+        if sort not in SORT_FIELDS:
+            raise ValueError(f"Cannot sort by {sort}, expected one of {', '.join(SORT_FIELDS)}")
+        fields = tuple(fields) if fields else FIELDS
+        unknown = set(fields) - set(FIELDS)
+        if unknown:
+            raise ValueError(f"Unknown credit fields {', '.join(sorted(unknown))}")
+
+        accepted_codes = {}
+        for name, accepted in criteria.items():
+            if name not in self._category_codes:
+                raise ValueError(f"{name} is not categorical, expected one of {', '.join(CATEGORICAL_FIELDS)}")
+            if not isinstance(accepted, (list, tuple, set, frozenset)):
+                accepted = (accepted,)
+            codes = self._category_codes[name]
+            accepted_codes[name] = [codes[value] for value in accepted if value in codes]
+
+        rows, keys, ids = self._sort_index(sort)
+        start, stop = 0, len(rows)
+        price_bounded = min_price is not None or max_price is not None
+        # A price range is a slice of the price index
+        if sort == "price" and price_bounded:
+            start, stop = self._price_bounds(min_price, max_price)
+        if cursor is not None:
+            key, credit_id = decode_cursor(cursor)
+            key_type = str if sort == "id" else (int, float)
+            if not isinstance(key, key_type) or isinstance(key, bool) or not isinstance(credit_id, str):
+                raise ValueError(f"Cursor does not belong to a page sorted by {sort}")
+            if descending:
+                stop = min(stop, self._position(keys, ids, key, credit_id, "left"))
+            else:
+                start = max(start, self._position(keys, ids, key, credit_id, "right"))
+
+        in_range = None
+        if sort != "price" and price_bounded:
+            low, high = self._price_bounds(min_price, max_price)
+            # Few rows in the price range: ordering them beats scanning the sort index for them
+            if (high - low) ** 2 <= limit * len(rows):
+                in_range = self._sort_index("price")[0][low:high]
+
+        picked: List[np.ndarray] = []
+        if in_range is not None:
+            positions = np.sort(self._positions(sort)[in_range])
+            positions = positions[(positions >= start) & (positions < stop)]
+            if descending:
+                positions = positions[::-1]
+            mask = np.ones(len(positions), dtype=bool)
+            for name, codes in accepted_codes.items():
+                mask &= np.isin(self._columns[name][rows[positions]], codes)
+            picked.append(positions[mask][:limit])
+            start = stop
+
+        # Scan from the cursor in growing chunks until the page is full or the range is exhausted
+        found = sum(len(positions) for positions in picked)
+        chunk = max(2 * limit, 64)
+        while found < limit and start < stop:
+            if descending:
+                positions = np.arange(stop - 1, max(stop - chunk, start) - 1, -1)
+                stop = positions[-1]
+            else:
+                positions = np.arange(start, min(start + chunk, stop))
+                start = positions[-1] + 1
+            candidates = rows[positions]
+            mask = np.ones(len(positions), dtype=bool)
+            for name, codes in accepted_codes.items():
+                mask &= np.isin(self._columns[name][candidates], codes)
+            if sort != "price" and price_bounded:
+                prices = self._columns["price"][candidates]
+                if min_price is not None:
+                    mask &= prices >= min_price
+                if max_price is not None:
+                    mask &= prices <= max_price
+            positions = positions[mask][:limit - found]
+            picked.append(positions)
+            found += len(positions)
+            chunk *= 2
+
+        positions = np.concatenate(picked) if picked else np.empty(0, dtype=np.int64)
+        records = self.records(rows[positions], fields)
+        # Like trade history pages, a full page always carries a cursor; the next page may be empty
+        next_cursor = None
+        if len(positions) == limit:
+            last = positions[-1]
+            next_cursor = encode_cursor(keys[last].item(), str(ids[last]))
+        return {"credits": records, "next_cursor": next_cursor}
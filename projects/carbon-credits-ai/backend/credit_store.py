@@ -0,0 +1,167 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Credit Repository
+Indexed in-memory store of carbon credits
+"""
+
+from bisect import bisect_left, bisect_right, insort
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Tuple
+
+INDEXED_FIELDS = ("type", "certification", "location")
+
+
+class CreditRepository:
+    """Carbon credits indexed by id, by category and by price
+
+    The id index is a hash map, so lookups are O(1). Each field in
+    `INDEXED_FIELDS` has a secondary index from value to the ids carrying it,
+    so filters are index probes whose cost depends on the number of matches
+    rather than on the number of listed credits. A list of (price, sequence,
+    id) kept sorted serves price range queries with two binary searches.
+
+    Results come back in listing order, like a scan over a plain list would.
+    Credits may be pydantic models or plain dicts; `field` reads a value from
+    one. After changing a credit's price or an indexed field, pass it to
+    `update` so the indexes follow; other fields such as volume can be
+    mutated in place.
+    """
+
+    def __init__(
+        self,
+        credits: Iterable = (),
+        field: Callable[[object, str], object] = getattr,
+        indexed_fields: Tuple[str, ...] = INDEXED_FIELDS
+    ):
+        self.field = field
+        self.indexed_fields = indexed_fields
+        self._by_id: Dict[str, object] = {}
+        self._sequence: Dict[str, int] = {}
+        self._next_sequence = 0
+        self._indexes: Dict[str, Dict[object, Dict[str, None]]] = {name: {} for name in indexed_fields}
+        self._by_price: List[Tuple[float, int, str]] = []
+        self._keys: Dict[str, Tuple[tuple, Tuple[float, int, str]]] = {}
+
+        self.extend(credits)
+
+    def __len__(self) -> int:
+        return len(self._by_id)
+
+    def __iter__(self) -> Iterator:
+        return iter(list(self._by_id.values()))
+
+    def __contains__(self, credit_id: str) -> bool:
+        return credit_id in self._by_id
+
+    def all(self) -> List:
+        """Every credit in listing order"""
+        return list(self._by_id.values())
+
+    def get(self, credit_id: str) -> Optional[object]:
+        """Credit with the given id, or None"""
+        return self._by_id.get(credit_id)
+
+    def add(self, credit):
+        """List a credit; a credit with the same id is replaced in its place"""
+        credit_id = self.field(credit, "id")
+        if credit_id in self._by_id:
+            self._unindex(credit_id)
+        else:
+            self._sequence[credit_id] = self._next_sequence
+            self._next_sequence += 1
+
+        self._by_id[credit_id] = credit
+        self._index(credit_id, credit)
+
+    def extend(self, credits: Iterable):
+        """List many credits, sorting the price index once instead of per credit"""
+        pending = []
+        for credit in credits:
+            credit_id = self.field(credit, "id")
+            if credit_id in self._by_id:
+                self.add(credit)
+                continue
+            self._sequence[credit_id] = self._next_sequence
+            self._next_sequence += 1
+            self._by_id[credit_id] = credit
+            pending.append(self._index(credit_id, credit, sort=False))
+
+        if pending:
+            self._by_price.extend(pending)
+            self._by_price.sort()
+
+    def update(self, credit):
+        """Reindex a listed credit after its price or an indexed field changed"""
+        credit_id = self.field(credit, "id")
+        if credit_id not in self._by_id:
+            raise KeyError(credit_id)
+        self.add(credit)
+
+    def remove(self, credit_id: str) -> Optional[object]:
+        """Delist a credit and return it, or None if it is not listed"""
+        credit = self._by_id.pop(credit_id, None)
+        if credit is not None:
+            self._unindex(credit_id)
+            del self._sequence[credit_id]
+        return credit
+
+    def _index(self, credit_id: str, credit, sort: bool = True) -> Tuple[float, int, str]:
+        # Remember the indexed values, so a credit changed in place can still be unindexed
+        keys = tuple(self.field(credit, name) for name in self.indexed_fields)
+        price_entry = (float(self.field(credit, "price")), self._sequence[credit_id], credit_id)
+        self._keys[credit_id] = (keys, price_entry)
+
+        for name, value in zip(self.indexed_fields, keys):
+            self._indexes[name].setdefault(value, {})[credit_id] = None
+        if sort:
+            insort(self._by_price, price_entry)
+        return price_entry
+
+    def _unindex(self, credit_id: str):
+        keys, price_entry = self._keys.pop(credit_id)
+        for name, value in zip(self.indexed_fields, keys):
+            index = self._indexes[name]
+            bucket = index[value]
+            del bucket[credit_id]
+            if not bucket:
+                del index[value]
+        del self._by_price[bisect_left(self._by_price, price_entry)]
+
+    def values(self, name: str) -> List:
+        """Distinct values of an indexed field"""
+        return list(self._indexes[name])
+
+    def count(self, name: str, value) -> int:
+        """Number of credits whose indexed field has the given value"""
+        return len(self._indexes[name].get(value, ()))
+
+    def find(self, **criteria) -> List:
+        """Credits matching every criterion, in listing order
+
+        Each keyword names an indexed field and gives either one value or a
+        list, tuple or set of accepted values, e.g. find(type=["forest", "ocean"]).
+        """
+        matches: Optional[set] = None
+        for name, accepted in criteria.items():
+            if name not in self._indexes:
+                raise ValueError(f"{name} is not indexed, expected one of {', '.join(self.indexed_fields)}")
+            if not isinstance(accepted, (list, tuple, set, frozenset)):
+                accepted = (accepted,)
+
+            index = self._indexes[name]
+            ids = set()
+            for value in accepted:
+                ids.update(index.get(value, ()))
+
+            matches = ids if matches is None else matches & ids
+            if not matches:
+                return []
+
+        if matches is None:
+            return self.all()
+        return [self._by_id[credit_id] for credit_id in sorted(matches, key=self._sequence.__getitem__)]
+
+    def price_range(self, low: Optional[float] = None, high: Optional[float] = None) -> List:
+        """Credits priced within [low, high], cheapest first"""
+        start = 0 if low is None else bisect_left(self._by_price, (low,))
+        stop = len(self._by_price) if high is None else bisect_right(self._by_price, (high, float("inf")))
+        return [self._by_id[credit_id] for _, _, credit_id in self._by_price[start:stop]]
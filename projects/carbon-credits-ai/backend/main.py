@@ -10,13 +10,26 @@ import pandas as pd
 from datetime import datetime, timedelta
 from typing import List, Dict, Optional
 import logging
-from fastapi import FastAPI, HTTPException, BackgroundTasks
+import time
+from fastapi import FastAPI, HTTPException, BackgroundTasks, Query, Response
 from fastapi.middleware.cors import CORSMiddleware
 from pydantic import BaseModel
 import uvicorn
+import sklearn
 from sklearn.ensemble import RandomForestRegressor
 from sklearn.model_selection import train_test_split
 import json
+import os
+import threading
+
+from compute import ComputeExecutor
+from credit_inventory import CreditInventory
+from market_analytics import MarketAnalytics
+from market_data import MarketDataset
+from order_book import MatchingEngine
+from portfolio_optimizer import PortfolioOptimizer
+from price_model_store import PriceModelStore, config_hash
+from trade_journal import TradeJournal
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
@@ -39,46 +52,105 @@ class TradeRequest(BaseModel):
     buyer_id: str
     price_per_ton: float
 
+class OrderRequest(BaseModel):
+    credit_id: str
+    side: str  # "buy" or "sell"
+    quantity: int
+    trader_id: str
+    price: Optional[float] = None  # Limit price per ton; market order if omitted
+    time_in_force: str = "gtc"     # "gtc" rests the remainder, "ioc" cancels it
+
+class MarketDay(BaseModel):
+    date: datetime
+    price: float
+    volume: float
+    temperature: float
+    carbon_demand: float
+    region: str = "global"
+
 class PortfolioOptimization(BaseModel):
     user_id: str
     budget: float
     risk_tolerance: float
     sustainability_goals: List[str]
+    max_position_share: Optional[float] = None  # Max fraction of the budget in one credit
+    max_type_share: Optional[float] = None      # Max fraction of the budget in one credit type
+    type_caps: Dict[str, float] = {}            # Max spend per credit type
+    time_limit_ms: Optional[float] = None
+
+# Features of the price prediction model, in training order
+PRICE_FEATURES = ['volume', 'temperature', 'season', 'day_of_week', 'carbon_demand']
+
+# Everything that determines the fitted price model; a change invalidates the stored one
+PRICE_MODEL_CONFIG = {
+    "estimator": "RandomForestRegressor",
+    "n_estimators": 100,
+    "random_state": 42,
+    "test_size": 0.2,
+    "features": PRICE_FEATURES,
+    "data_seed": 42,
+    "training_start": "2023-01-01",
+    "training_end": "2024-01-01",
+    "regions": os.environ.get("CARBON_MARKET_REGIONS", "global").split(","),
+    "sklearn_version": sklearn.__version__
+}
+
+# Trader id of the resting sell order that lists each credit's volume; reserved for the server
+LISTING_TRADER = "listing"
+
+# Price adjustments by credit type and certification
+TYPE_MULTIPLIERS = {
+    "renewable": 1.1,
+    "forest": 1.0,
+    "ocean": 1.2,
+    "industrial": 0.9
+}
+
+CERTIFICATION_MULTIPLIERS = {
+    "VCS": 1.0,
+    "Gold Standard": 1.15,
+    "CDM": 1.05,
+    "CAR": 1.08
+}
+
+def _lookup(values: List[str], table: Dict[str, float], default: float = 1.0) -> np.ndarray:
+    """Map labels to table values, resolving each distinct label only once"""
+    labels, codes = np.unique(np.asarray(values), return_inverse=True)
+    return np.array([table.get(label, default) for label in labels])[codes.ravel()]
 
 class CarbonCreditsAI:
     """AI-powered carbon credit trading system"""
     
     def __init__(self):
-        self.credits: List[CarbonCredit] = []
-        self.price_model = RandomForestRegressor(n_estimators=100, random_state=42)
-        self.trading_history = []
-        self.market_data = pd.DataFrame()
+        self.credits = CreditInventory(model=CarbonCredit.model_construct)
+        self.price_model = None
+        self.price_model_metadata: Dict = {}
+        self.model_store = PriceModelStore()
+        self.optimizer = PortfolioOptimizer()
+        self.prediction_executor = ComputeExecutor("prediction", kind="thread")
+        self.optimization_executor = ComputeExecutor("optimizer")
+        self.journal = TradeJournal()
+        self.order_book = MatchingEngine()
+        self.listing_orders: Dict[str, str] = {}  # order id -> credit id of each listing order
+        # Tons each trader bought and has not yet offered for sale: trader id -> credit id -> tons
+        self.holdings: Dict[str, Dict[str, int]] = {}
+        self._holdings_lock = threading.Lock()
+        self.market = MarketDataset(seed=PRICE_MODEL_CONFIG["data_seed"])
+        self.analytics = MarketAnalytics()
+        self.market.subscribe(
+            lambda dates, regions, values: self.analytics.update(dates, values["price"], values["volume"])
+        )
         self._initialize_market_data()
-        self._train_price_model()
+        self._load_price_model()
         
     def _initialize_market_data(self):
         """Initialize sample market data for AI training"""
-        np.random.seed(42)
-        dates = pd.date_range(start='2023-01-01', end='2024-01-01', freq='D')
-        
-        data = []
-        for date in dates:
-            # Simulate carbon credit market data
-            base_price = 25 + np.random.normal(0, 5)
-            volume = 1000 + np.random.normal(0, 200)
-            temperature = 15 + 10 * np.sin(2 * np.pi * date.dayofyear / 365) + np.random.normal(0, 3)
-            
-            data.append({
-                'date': date,
-                'price': max(base_price, 5),  # Minimum price of $5
-                'volume': max(volume, 100),
-                'temperature': temperature,
-                'season': date.month % 4,
-                'day_of_week': date.weekday(),
-                'carbon_demand': np.random.uniform(0.7, 1.3)
-            })
-        
-        self.market_data = pd.DataFrame(data)
+        np.random.seed(PRICE_MODEL_CONFIG["data_seed"])
+        self.market.synthesize(
+            PRICE_MODEL_CONFIG["training_start"],
+            PRICE_MODEL_CONFIG["training_end"],
+            PRICE_MODEL_CONFIG["regions"]
+        )
         
         # Initialize sample carbon credits
         credit_types = ["renewable", "forest", "ocean", "industrial"]
@@ -100,7 +172,22 @@ class CarbonCreditsAI:
                 co2_tons=np.random.uniform(0.5, 10.0),
                 timestamp=datetime.now() - timedelta(days=np.random.randint(0, 30))
             )
-            self.credits.append(credit)
+            self.credits.add(credit)
+            listing = self.order_book.submit(credit.id, "sell", credit.volume, LISTING_TRADER, price=credit.price)
+            self.listing_orders[listing["order"].order_id] = credit.id
+    
+    @property
+    def market_data(self) -> pd.DataFrame:
+        """Market data as a DataFrame, one row per region and day"""
+        return self.market.frame
+    
+    def append_market_data(self, days: List[MarketDay]) -> Dict:
+        """Ingest observed market days"""
+        try:
+            self.market.ingest(pd.DataFrame([day.model_dump() for day in days]))
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
+        return {"rows": len(self.market), "last_date": self.market.last_date}
     
     def _get_base_price_for_type(self, credit_type: str) -> float:
         """Get base price for different credit types"""
@@ -112,127 +199,196 @@ class CarbonCreditsAI:
         }
         return base_prices.get(credit_type, 25)
     
+    def _load_price_model(self):
+        """Load the price model from the store, training and saving it if missing or stale"""
+        digest = config_hash(PRICE_MODEL_CONFIG)
+        started = time.perf_counter()
+        
+        if self.model_store.has(digest):
+            try:
+                self.price_model, self.price_model_metadata = self.model_store.load(digest)
+                logger.info(f"Loaded price model {digest} in {time.perf_counter() - started:.2f}s")
+                return
+            except Exception as e:
+                logger.warning(f"Failed to load stored price model {digest}, retraining: {e}")
+        
+        self._train_price_model()
+        if self.price_model_metadata:
+            try:
+                self.model_store.save(digest, self.price_model, self.price_model_metadata)
+                self.price_model_metadata = self.model_store.metadata(digest)
+            except Exception as e:
+                logger.warning(f"Failed to save price model {digest}: {e}")
+    
     def _train_price_model(self):
         """Train AI model for price prediction"""
         try:
             # Prepare features for ML model
-            X = self.market_data[['volume', 'temperature', 'season', 'day_of_week', 'carbon_demand']]
+            X = self.market_data[PRICE_FEATURES]
             y = self.market_data['price']
             
-            X_train, X_test, y_train, y_test = train_test_split(X, y, test_size=0.2, random_state=42)
+            X_train, X_test, y_train, y_test = train_test_split(
+                X, y, test_size=PRICE_MODEL_CONFIG["test_size"], random_state=PRICE_MODEL_CONFIG["random_state"]
+            )
             
+            started = time.perf_counter()
+            self.price_model = RandomForestRegressor(
+                n_estimators=PRICE_MODEL_CONFIG["n_estimators"], random_state=PRICE_MODEL_CONFIG["random_state"]
+            )
             self.price_model.fit(X_train, y_train)
             
             # Calculate model accuracy
             score = self.price_model.score(X_test, y_test)
             logger.info(f"Carbon credit price prediction model trained with accuracy: {score:.3f}")
             
+            self.price_model_metadata = {
+                **PRICE_MODEL_CONFIG,
+                "data_start": self.market_data['date'].min().isoformat(),
+                "data_end": self.market_data['date'].max().isoformat(),
+                "train_samples": len(X_train),
+                "test_samples": len(X_test),
+                "test_score": float(score),
+                "training_seconds": time.perf_counter() - started
+            }
+            
         except Exception as e:
             logger.error(f"Failed to train price model: {e}")
     
     def predict_optimal_price(self, credit: CarbonCredit) -> float:
         """Predict optimal price for a carbon credit using AI"""
+        return float(self.predict_optimal_prices([credit])[0])
+    
+    def predict_optimal_prices(self, credits: List[CarbonCredit]) -> np.ndarray:
+        """Predict optimal prices for many carbon credits with a single model call"""
+        prices = np.array([credit.price for credit in credits], dtype=float)
+        if not credits:
+            return prices
+        
         try:
-            # Prepare features for prediction
-            features = np.array([[
-                credit.volume,
-                np.random.uniform(10, 30),  # Simulated temperature
-                datetime.now().month % 4,   # Season
-                datetime.now().weekday(),   # Day of week
-                np.random.uniform(0.8, 1.2) # Carbon demand
-            ]])
+            # Prepare one feature matrix for all credits
+            count = len(credits)
+            now = datetime.now()
+            features = pd.DataFrame(np.column_stack([
+                np.array([credit.volume for credit in credits], dtype=float),
+                np.random.uniform(10, 30, count),   # Simulated temperature
+                np.full(count, now.month % 4),      # Season
+                np.full(count, now.weekday()),      # Day of week
+                np.random.uniform(0.8, 1.2, count)  # Carbon demand
+            ]), columns=PRICE_FEATURES)
             
-            predicted_price = self.price_model.predict(features)[0]
+            predicted_prices = self.price_model.predict(features)
             
             # Adjust based on credit type and certification
-            type_multiplier = {
-                "renewable": 1.1,
-                "forest": 1.0,
-                "ocean": 1.2,
-                "industrial": 0.9
-            }
-            
-            cert_multiplier = {
-                "VCS": 1.0,
-                "Gold Standard": 1.15,
-                "CDM": 1.05,
-                "CAR": 1.08
-            }
+            type_multiplier = _lookup([credit.type for credit in credits], TYPE_MULTIPLIERS)
+            cert_multiplier = _lookup([credit.certification for credit in credits], CERTIFICATION_MULTIPLIERS)
             
-            adjusted_price = predicted_price * type_multiplier.get(credit.type, 1.0) * cert_multiplier.get(credit.certification, 1.0)
+            adjusted_prices = predicted_prices * type_multiplier * cert_multiplier
             
-            return max(adjusted_price, 5)  # Minimum price of $5
+            return np.maximum(adjusted_prices, 5)  # Minimum price of $5
             
         except Exception as e:
             logger.error(f"Price prediction failed: {e}")
-            return credit.price
+            return prices
     
-    def optimize_portfolio(self, optimization: PortfolioOptimization) -> Dict:
-        """AI-powered portfolio optimization"""
+    async def optimize_portfolio(self, optimization: PortfolioOptimization) -> Dict:
+        """Portfolio optimization with prediction and solving on the compute executors"""
         try:
-            # Filter credits by sustainability goals
-            available_credits = []
-            for credit in self.credits:
-                if credit.type in optimization.sustainability_goals or not optimization.sustainability_goals:
-                    available_credits.append(credit)
-            
-            if not available_credits:
-                raise HTTPException(status_code=400, detail="No credits match sustainability goals")
-            
-            # Calculate risk-adjusted returns
-            portfolio = []
-            remaining_budget = optimization.budget
-            
-            # Sort credits by AI-predicted value
-            credits_with_predictions = []
-            for credit in available_credits:
-                predicted_price = self.predict_optimal_price(credit)
-                value_score = (predicted_price / credit.price) * (1 / (1 + optimization.risk_tolerance))
-                credits_with_predictions.append((credit, predicted_price, value_score))
-            
-            credits_with_predictions.sort(key=lambda x: x[2], reverse=True)
-            
-            # Build optimal portfolio
-            for credit, predicted_price, value_score in credits_with_predictions:
-                if remaining_budget <= 0:
-                    break
-                
-                max_quantity = min(
-                    credit.volume,
-                    int(remaining_budget / predicted_price)
-                )
-                
-                if max_quantity > 0:
-                    portfolio.append({
-                        "credit_id": credit.id,
-                        "type": credit.type,
-                        "quantity": max_quantity,
-                        "price_per_ton": predicted_price,
-                        "total_cost": max_quantity * predicted_price,
-                        "co2_tons": max_quantity * credit.co2_tons,
-                        "predicted_return": value_score
-                    })
-                    remaining_budget -= max_quantity * predicted_price
+            credits, predicted_prices, value_scores = await self.prediction_executor.run(
+                self._portfolio_candidates, optimization
+            )
             
-            # Calculate portfolio metrics
-            total_cost = sum(item["total_cost"] for item in portfolio)
-            total_co2 = sum(item["co2_tons"] for item in portfolio)
-            avg_price = total_cost / total_co2 if total_co2 > 0 else 0
+            # Let the solver stop on its own well before the request times out
+            problem = self._allocation_problem(optimization, credits, predicted_prices, value_scores)
+            time_limit_ms = optimization.time_limit_ms or self.optimizer.time_limit_ms
+            problem["time_limit_ms"] = min(time_limit_ms, self.optimization_executor.timeout * 500)
+            allocation = await self.optimization_executor.run(self.optimizer.solve, **problem)
             
-            return {
-                "portfolio": portfolio,
-                "total_cost": total_cost,
-                "total_co2_tons": total_co2,
-                "average_price_per_ton": avg_price,
-                "remaining_budget": remaining_budget,
-                "diversification_score": len(set(item["type"] for item in portfolio)) / 4,
-                "sustainability_impact": self._calculate_sustainability_impact(portfolio)
-            }
+            return self._portfolio_result(optimization, credits, predicted_prices, value_scores, allocation)
             
+        except HTTPException:
+            raise
         except Exception as e:
             logger.error(f"Portfolio optimization failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
+    def _portfolio_candidates(self, optimization: PortfolioOptimization):
+        """Credits matching the goals with their predicted prices and value scores"""
+        # Filter credits by sustainability goals
+        if optimization.sustainability_goals:
+            available_credits = self.credits.find(type=optimization.sustainability_goals)
+        else:
+            available_credits = self.credits.all()
+        
+        if not available_credits:
+            raise HTTPException(status_code=400, detail="No credits match sustainability goals")
+        
+        # Calculate risk-adjusted returns
+        predicted_prices = self.predict_optimal_prices(available_credits)
+        listed_prices = np.array([credit.price for credit in available_credits])
+        value_scores = (predicted_prices / listed_prices) * (1 / (1 + optimization.risk_tolerance))
+        
+        return available_credits, predicted_prices, value_scores
+    
+    def _allocation_problem(self, optimization: PortfolioOptimization, credits: List[CarbonCredit],
+                            predicted_prices: np.ndarray, value_scores: np.ndarray) -> Dict:
+        """Arguments of PortfolioOptimizer.solve: allocate the budget at predicted prices"""
+        return {
+            "costs": predicted_prices,
+            "scores": value_scores,
+            "volumes": np.array([credit.volume for credit in credits]),
+            "types": np.array([credit.type for credit in credits]),
+            "budget": optimization.budget,
+            "max_position_share": optimization.max_position_share,
+            "max_type_share": optimization.max_type_share,
+            "type_caps": optimization.type_caps,
+            "time_limit_ms": optimization.time_limit_ms
+        }
+    
+    def _portfolio_result(self, optimization: PortfolioOptimization, credits: List[CarbonCredit],
+                          predicted_prices: np.ndarray, value_scores: np.ndarray, allocation: Dict) -> Dict:
+        quantities = allocation["quantities"]
+        
+        # Build optimal portfolio, best value first
+        portfolio = []
+        for i in np.argsort(-value_scores, kind="stable"):
+            if quantities[i] <= 0:
+                continue
+            credit = credits[i]
+            quantity = int(quantities[i])
+            predicted_price = float(predicted_prices[i])
+            portfolio.append({
+                "credit_id": credit.id,
+                "type": credit.type,
+                "quantity": quantity,
+                "price_per_ton": predicted_price,
+                "total_cost": quantity * predicted_price,
+                "co2_tons": quantity * credit.co2_tons,
+                "predicted_return": float(value_scores[i])
+            })
+        
+        # Calculate portfolio metrics
+        total_cost = sum(item["total_cost"] for item in portfolio)
+        total_co2 = sum(item["co2_tons"] for item in portfolio)
+        avg_price = total_cost / total_co2 if total_co2 > 0 else 0
+        remaining_budget = optimization.budget - total_cost
+        
+        return {
+            "portfolio": portfolio,
+            "total_cost": total_cost,
+            "total_co2_tons": total_co2,
+            "average_price_per_ton": avg_price,
+            "remaining_budget": remaining_budget,
+            "diversification_score": len(set(item["type"] for item in portfolio)) / 4,
+            "sustainability_impact": self._calculate_sustainability_impact(portfolio),
+            "optimizer": {
+                "status": allocation["status"],
+                "objective": allocation["objective"],
+                "upper_bound": allocation["upper_bound"],
+                "optimality_gap": allocation["gap"],
+                "elapsed_ms": allocation["elapsed_ms"]
+            }
+        }
+    
     def _calculate_sustainability_impact(self, portfolio: List[Dict]) -> Dict:
         """Calculate sustainability impact metrics"""
         type_impacts = {
@@ -259,44 +415,128 @@ class CarbonCreditsAI:
         
         return total_impact
     
+    def place_order(self, order: OrderRequest) -> Dict:
+        """Match an order against the credit's order book and settle its fills"""
+        credit = self.credits.get(order.credit_id)
+        if not credit:
+            raise HTTPException(status_code=404, detail="Carbon credit not found")
+        if order.trader_id == LISTING_TRADER:
+            raise HTTPException(status_code=400, detail=f"Trader id {LISTING_TRADER} is reserved")
+        
+        # A sell order reserves the tons it offers, so they cannot be sold twice
+        selling = order.side == "sell"
+        if selling:
+            self._reserve(order.trader_id, order.credit_id, order.quantity)
+        try:
+            result = self.order_book.submit(
+                order.credit_id,
+                order.side,
+                order.quantity,
+                order.trader_id,
+                price=order.price,
+                time_in_force=order.time_in_force
+            )
+        except ValueError as e:
+            if selling:
+                self._release(order.trader_id, order.credit_id, order.quantity)
+            raise HTTPException(status_code=400, detail=str(e))
+        
+        trades = [self._settle(credit, fill) for fill in result["fills"]]
+        if selling and result["order"].status == "cancelled":
+            # Unfilled quantity of a market or immediate-or-cancel sell never rested
+            self._release(order.trader_id, order.credit_id, order.quantity - result["order"].filled)
+        return {
+            "order": result["order"].to_dict(),
+            "trades": trades,
+            "remaining_volume": credit.volume
+        }
+    
+    def holding(self, trader_id: str, credit_id: str) -> int:
+        """Tons of a credit a trader holds and may still offer for sale"""
+        return self.holdings.get(trader_id, {}).get(credit_id, 0)
+    
+    def _reserve(self, trader_id: str, credit_id: str, quantity: int):
+        with self._holdings_lock:
+            held = self.holding(trader_id, credit_id)
+            if held < quantity:
+                raise HTTPException(
+                    status_code=400,
+                    detail=f"Insufficient holdings: {trader_id} can sell {held} tons of {credit_id}"
+                )
+            self.holdings[trader_id][credit_id] = held - quantity
+    
+    def _release(self, trader_id: str, credit_id: str, quantity: int):
+        if quantity <= 0:
+            return
+        with self._holdings_lock:
+            positions = self.holdings.setdefault(trader_id, {})
+            positions[credit_id] = positions.get(credit_id, 0) + quantity
+    
+    def _settle(self, credit: CarbonCredit, fill: Dict) -> Dict:
+        """Record a fill in the journal and deliver the tons to the buyer
+
+        Fills of the listing order reduce the credit's volume; a trader's
+        tons were already taken from their holdings when the sell order was
+        placed.
+        """
+        if fill["sell_order_id"] in self.listing_orders:
+            credit.volume -= fill["quantity"]
+            self.credits.set(credit.id, volume=credit.volume)
+        self._release(fill["buyer_id"], credit.id, fill["quantity"])
+        
+        return self.journal.append({
+            "credit_id": credit.id,
+            "buyer_id": fill["buyer_id"],
+            "seller_id": fill["seller_id"],
+            "quantity": fill["quantity"],
+            "price_per_ton": fill["price"],
+            "total_cost": fill["quantity"] * fill["price"],
+            "co2_tons": fill["quantity"] * credit.co2_tons,
+            "timestamp": fill["timestamp"],
+            "credit_type": credit.type,
+            "location": credit.location,
+            "buy_order_id": fill["buy_order_id"],
+            "sell_order_id": fill["sell_order_id"]
+        })
+    
+    def cancel_order(self, order_id: str) -> Dict:
+        """Cancel a client's resting order; listing orders can only be withdrawn with the listing"""
+        if order_id in self.listing_orders:
+            raise HTTPException(status_code=403, detail="Listing orders cannot be cancelled")
+        try:
+            order = self.order_book.cancel(order_id)
+        except KeyError:
+            raise HTTPException(status_code=404, detail="Open order not found")
+        if order.side == "sell":
+            self._release(order.trader_id, order.listing, order.quantity - order.filled)
+        return order.to_dict()
+    
     def execute_trade(self, trade: TradeRequest) -> Dict:
-        """Execute a carbon credit trade"""
+        """Execute a carbon credit trade
+        
+        The trade is an immediate-or-cancel buy limited to price_per_ton: it
+        fills against the cheapest asks at their own prices, possibly
+        partially, and any unfilled quantity is cancelled.
+        """
         try:
-            # Find the credit
-            credit = next((c for c in self.credits if c.id == trade.credit_id), None)
-            if not credit:
-                raise HTTPException(status_code=404, detail="Carbon credit not found")
-            
-            if credit.volume < trade.quantity:
-                raise HTTPException(status_code=400, detail="Insufficient credit volume")
-            
-            # Execute trade
-            trade_cost = trade.quantity * trade.price_per_ton
-            co2_tons = trade.quantity * credit.co2_tons
-            
-            # Update credit volume
-            credit.volume -= trade.quantity
-            
-            # Record trade
-            trade_record = {
-                "trade_id": f"TRADE_{len(self.trading_history) + 1:06d}",
-                "credit_id": trade.credit_id,
-                "buyer_id": trade.buyer_id,
-                "quantity": trade.quantity,
-                "price_per_ton": trade.price_per_ton,
-                "total_cost": trade_cost,
-                "co2_tons": co2_tons,
-                "timestamp": datetime.now(),
-                "credit_type": credit.type,
-                "location": credit.location
-            }
-            
-            self.trading_history.append(trade_record)
+            result = self.place_order(OrderRequest(
+                credit_id=trade.credit_id,
+                side="buy",
+                quantity=trade.quantity,
+                trader_id=trade.buyer_id,
+                price=trade.price_per_ton,
+                time_in_force="ioc"
+            ))
+            if not result["trades"]:
+                raise HTTPException(status_code=400, detail="No sell orders at or below the requested price")
             
             return {
                 "success": True,
-                "trade_record": trade_record,
-                "remaining_volume": credit.volume
+                "filled_quantity": result["order"]["filled"],
+                # First fill, for clients of the single-fill response
+                "trade_record": result["trades"][0],
+                "trade_records": result["trades"],
+                "remaining_volume": result["remaining_volume"]
             }
             
         except HTTPException:
@@ -318,6 +558,11 @@ app.add_middleware(
 # Initialize AI system
 carbon_ai = CarbonCreditsAI()
 
+@app.on_event("shutdown")
+async def shutdown_executors():
+    carbon_ai.prediction_executor.shutdown()
+    carbon_ai.optimization_executor.shutdown()
+
 @app.get("/")
 async def root():
     return {
@@ -327,24 +572,74 @@ async def root():
         "ai_model_accuracy": "trained"
     }
 
-@app.get("/api/credits")
-async def get_carbon_credits():
-    """Get all available carbon credits"""
+@app.get("/api/model")
+async def get_price_model():
+    """Get metadata of the price prediction model"""
+    return {
+        "success": carbon_ai.price_model is not None,
+        "model": carbon_ai.price_model_metadata
+    }
+
+@app.get("/api/compute")
+async def get_compute_stats():
+    """Get load of the prediction and optimization executors"""
     return {
         "success": True,
-        "credits": carbon_ai.credits,
-        "total_count": len(carbon_ai.credits)
+        "prediction": carbon_ai.prediction_executor.stats(),
+        "optimization": carbon_ai.optimization_executor.stats()
     }
 
+@app.get("/api/credits")
+async def get_carbon_credits(
+    credit_type: Optional[List[str]] = Query(None, alias="type"),
+    certification: Optional[List[str]] = Query(None),
+    location: Optional[List[str]] = Query(None),
+    min_price: Optional[float] = None,
+    max_price: Optional[float] = None,
+    sort: str = "id",
+    order: str = Query("asc", pattern="^(asc|desc)$"),
+    limit: int = Query(50, ge=1, le=1000),
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None
+):
+    """Get a page of carbon credits, filtered, sorted and projected; pass next_cursor back to page further"""
+    criteria = {
+        name: values
+        for name, values in (("type", credit_type), ("certification", certification), ("location", location))
+        if values
+    }
+    query = {
+        "limit": limit,
+        "cursor": cursor,
+        "sort": sort,
+        "descending": order == "desc",
+        "min_price": min_price,
+        "max_price": max_price,
+        "fields": fields.split(",") if fields else None,
+        **criteria
+    }
+    
+    def serialize(credits: CreditInventory) -> bytes:
+        page = credits.query(**query)
+        body = {"success": True, **page, "total_count": len(credits)}
+        return json.dumps(body, default=lambda value: value.isoformat()).encode()
+    
+    # Pages are serialized straight from the inventory columns, once per inventory change
+    try:
+        body = carbon_ai.credits.cached(json.dumps(query, sort_keys=True), serialize)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
+    return Response(content=body, media_type="application/json")
+
 @app.get("/api/credits/{credit_id}")
 async def get_credit_details(credit_id: str):
     """Get details of a specific carbon credit"""
-    credit = next((c for c in carbon_ai.credits if c.id == credit_id), None)
+    credit = carbon_ai.credits.get(credit_id)
     if not credit:
         raise HTTPException(status_code=404, detail="Carbon credit not found")
     
     # Get AI price prediction
-    predicted_price = carbon_ai.predict_optimal_price(credit)
+    predicted_price = await carbon_ai.prediction_executor.run(carbon_ai.predict_optimal_price, credit)
     
     return {
         "success": True,
@@ -356,7 +651,7 @@ async def get_credit_details(credit_id: str):
 @app.post("/api/optimize-portfolio")
 async def optimize_portfolio(optimization: PortfolioOptimization):
     """AI-powered portfolio optimization"""
-    result = carbon_ai.optimize_portfolio(optimization)
+    result = await carbon_ai.optimize_portfolio(optimization)
     return {"success": True, "optimization": result}
 
 @app.post("/api/trade")
@@ -365,29 +660,59 @@ async def execute_trade(trade: TradeRequest):
     result = carbon_ai.execute_trade(trade)
     return result
 
+@app.post("/api/orders")
+async def place_order(order: OrderRequest):
+    """Submit a limit or market order to a credit's order book"""
+    result = carbon_ai.place_order(order)
+    return {"success": True, **result}
+
+@app.delete("/api/orders/{order_id}")
+async def cancel_order(order_id: str):
+    """Cancel the open quantity of a resting order"""
+    order = carbon_ai.cancel_order(order_id)
+    return {"success": True, "order": order}
+
+@app.get("/api/holdings/{trader_id}")
+async def get_holdings(trader_id: str):
+    """Tons of each credit a trader bought and can still offer for sale"""
+    return {"success": True, "trader_id": trader_id, "holdings": dict(carbon_ai.holdings.get(trader_id, {}))}
+
+@app.get("/api/order-book/{credit_id}")
+async def get_order_book(credit_id: str, depth: int = Query(10, ge=1, le=100)):
+    """Get top of book and aggregated depth of a credit's order book"""
+    if credit_id not in carbon_ai.credits:
+        raise HTTPException(status_code=404, detail="Carbon credit not found")
+    return {"success": True, "book": carbon_ai.order_book.snapshot(credit_id, depth)}
+
 @app.get("/api/market-analytics")
-async def get_market_analytics():
-    """Get market analytics and trends"""
-    if carbon_ai.market_data.empty:
-        return {"success": False, "error": "No market data available"}
-    
-    latest_data = carbon_ai.market_data.tail(30)  # Last 30 days
+async def get_market_analytics(window: str = "30d"):
+    """Get market analytics and trends over a trailing window (7d, 30d, 90d or 365d)"""
+    try:
+        analytics = carbon_ai.analytics.snapshot(window)
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail=str(e))
     
-    analytics = {
-        "average_price": float(latest_data['price'].mean()),
-        "price_volatility": float(latest_data['price'].std()),
-        "total_volume": int(latest_data['volume'].sum()),
-        "price_trend": "up" if latest_data['price'].iloc[-1] > latest_data['price'].iloc[0] else "down",
-        "market_sentiment": "bullish" if latest_data['price'].mean() > carbon_ai.market_data['price'].mean() else "bearish"
-    }
+    if analytics is None:
+        return {"success": False, "error": "No market data available"}
     
     return {"success": True, "analytics": analytics}
 
+@app.post("/api/market-data")
+async def append_market_data(days: List[MarketDay]):
+    """Append observed market days"""
+    result = carbon_ai.append_market_data(days)
+    return {"success": True, **result}
+
 @app.get("/api/trading-history")
-async def get_trading_history():
-    """Get recent trading history"""
-    recent_trades = carbon_ai.trading_history[-20:]  # Last 20 trades
-    return {"success": True, "trades": recent_trades}
+async def get_trading_history(
+    limit: int = Query(20, ge=1, le=1000),
+    cursor: Optional[int] = Query(None, ge=1),
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None
+):
+    """Get trading history, newest page first; pass next_cursor back to page further"""
+    page = carbon_ai.journal.page(limit=limit, cursor=cursor, start=start, end=end)
+    return {"success": True, **page}
 
 if __name__ == "__main__":
     print("🌱 CarbonCredits AI Starting...")
@@ -0,0 +1,145 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Market Analytics
+Rolling-window market statistics kept up to date as market data is appended
+"""
+
+import math
+from typing import Dict, Optional
+
+import numpy as np
+
+WINDOWS = {
+    "7d": 7,
+    "30d": 30,
+    "90d": 90,
+    "365d": 365
+}
+
+DAY = np.timedelta64(1, "D")
+
+
+class MarketAnalytics:
+    """Price and volume statistics over trailing calendar windows
+
+    Rows are bucketed by day into per-day sums of price, squared price,
+    volume and row count, with prefix sums over days, so a window's mean, std
+    and volume are differences of two prefix entries. Window snapshots are
+    recomputed once per append and served from a dict, so reads are O(1).
+    Appending days at the end touches only the new days and any empty days
+    skipped before them; a row for an earlier day recomputes the prefix sums
+    from that day on.
+    """
+
+    def __init__(self, windows: Optional[Dict[str, int]] = None, capacity: int = 1024):
+        self.windows = windows or WINDOWS
+        self._origin: Optional[np.datetime64] = None
+        self._days = 0
+        self._daily = {name: np.zeros(capacity) for name in ("count", "price", "price_sq", "volume")}
+        self._prefix = {name: np.zeros(capacity + 1) for name in self._daily}
+        self._snapshots: Dict[str, Dict] = {}
+
+    def update(self, dates: np.ndarray, prices: np.ndarray, volumes: np.ndarray):
+        """Account appended market rows and refresh every window"""
+        if not len(dates):
+            return
+
+        days = np.asarray(dates).astype("datetime64[D]")
+        if self._origin is None:
+            self._origin = days.min()
+        elif days.min() < self._origin:
+            self._shift_origin(days.min())
+
+        offsets = ((days - self._origin) // DAY).astype(np.int64)
+        self._reserve(int(offsets.max()) + 1)
+
+        prices = np.asarray(prices, dtype=float)
+        np.add.at(self._daily["count"], offsets, 1)
+        np.add.at(self._daily["price"], offsets, prices)
+        np.add.at(self._daily["price_sq"], offsets, prices * prices)
+        np.add.at(self._daily["volume"], offsets, np.asarray(volumes, dtype=float))
+
+        # Start at the old end too: days skipped between it and the new rows still need their prefix entries
+        first = min(int(offsets.min()), self._days)
+        self._days = max(self._days, int(offsets.max()) + 1)
+        for name, daily in self._daily.items():
+            # prefix[i] holds the sum over days [0, i)
+            prefix = self._prefix[name]
+            prefix[first + 1:self._days + 1] = prefix[first] + np.cumsum(daily[first:self._days])
+
+        self._refresh()
+
+    def _reserve(self, days: int):
+        capacity = len(self._daily["count"])
+        if days <= capacity:
+            return
+        while capacity < days:
+            capacity *= 2
+        for name in self._daily:
+            daily = np.zeros(capacity)
+            daily[:self._days] = self._daily[name][:self._days]
+            self._daily[name] = daily
+            prefix = np.zeros(capacity + 1)
+            prefix[:self._days + 1] = self._prefix[name][:self._days + 1]
+            self._prefix[name] = prefix
+
+    def _shift_origin(self, origin: np.datetime64):
+        # Rare: data older than anything seen so far. Move existing days right and recompute.
+        shift = int((self._origin - origin) // DAY)
+        self._reserve(self._days + shift)
+        for name, daily in self._daily.items():
+            daily[shift:self._days + shift] = daily[:self._days].copy()
+            daily[:shift] = 0
+            self._prefix[name][1:self._days + shift + 1] = np.cumsum(daily[:self._days + shift])
+        self._days += shift
+        self._origin = origin
+
+    def _sum(self, name: str, start: int, stop: int) -> float:
+        prefix = self._prefix[name]
+        return float(prefix[stop] - prefix[start])
+
+    def _daily_mean(self, day: int) -> float:
+        return float(self._daily["price"][day] / self._daily["count"][day])
+
+    def _refresh(self):
+        last = self._days
+        all_count = self._sum("count", 0, last)
+        all_mean = self._sum("price", 0, last) / all_count
+
+        snapshots = {}
+        for window, length in self.windows.items():
+            start = max(last - length, 0)
+            count = self._sum("count", start, last)
+            price_sum = self._sum("price", start, last)
+            mean = price_sum / count
+
+            variance = 0.0
+            if count > 1:
+                # Sample variance, matching pandas' std()
+                variance = max((self._sum("price_sq", start, last) - price_sum * mean) / (count - 1), 0.0)
+
+            # Compare the first and last days of the window that have data
+            active = np.flatnonzero(self._daily["count"][start:last])
+            first_price = self._daily_mean(start + int(active[0]))
+            last_price = self._daily_mean(start + int(active[-1]))
+
+            snapshots[window] = {
+                "window": window,
+                "start_date": str(self._origin + start),
+                "end_date": str(self._origin + last - 1),
+                "samples": int(count),
+                "average_price": mean,
+                "price_volatility": math.sqrt(variance),
+                "total_volume": int(self._sum("volume", start, last)),
+                "price_change": (last_price / first_price - 1) * 100 if first_price else 0.0,
+                "price_trend": "up" if last_price > first_price else "down",
+                "market_sentiment": "bullish" if mean > all_mean else "bearish"
+            }
+
+        self._snapshots = snapshots
+
+    def snapshot(self, window: str = "30d") -> Optional[Dict]:
+        """Statistics of a trailing window, or None before any data arrived"""
+        if window not in self.windows:
+            raise ValueError(f"Unknown window {window}, expected one of {', '.join(self.windows)}")
+        return self._snapshots.get(window)
@@ -0,0 +1,274 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Order Book
+Price-time priority limit order books and the matching engine behind credit trading
+"""
+
+import itertools
+import math
+import threading
+from bisect import bisect_left, insort
+from collections import deque
+from datetime import datetime
+from typing import Dict, List, Optional
+
+SIDES = ("buy", "sell")
+TIME_IN_FORCE = ("gtc", "ioc")
+
+
+class Order:
+    """One limit or market order; `price` is None for market orders"""
+
+    __slots__ = ("order_id", "listing", "side", "price", "quantity", "filled", "remaining", "trader_id",
+                 "time_in_force", "status", "timestamp")
+
+    def __init__(self, order_id: str, listing: str, side: str, price: Optional[float], quantity: int,
+                 trader_id: str, time_in_force: str):
+        self.order_id = order_id
+        self.listing = listing
+        self.side = side
+        self.price = price
+        self.quantity = quantity
+        self.filled = 0
+        self.remaining = quantity
+        self.trader_id = trader_id
+        self.time_in_force = time_in_force
+        self.status = "open"
+        self.timestamp = datetime.now()
+
+    def to_dict(self) -> Dict:
+        return {
+            "order_id": self.order_id,
+            "listing": self.listing,
+            "side": self.side,
+            "price": self.price,
+            "quantity": self.quantity,
+            "filled": self.filled,
+            "remaining": self.remaining,
+            "trader_id": self.trader_id,
+            "time_in_force": self.time_in_force,
+            "status": self.status,
+            "timestamp": self.timestamp
+        }
+
+
+class _Level:
+    """FIFO queue of resting orders at one price, with their total open quantity"""
+
+    __slots__ = ("orders", "quantity")
+
+    def __init__(self):
+        self.orders = deque()
+        self.quantity = 0
+
+
+class OrderBook:
+    """Bids and asks for one listing, matched by price, then time
+
+    Each side keeps its price levels in a dict and the level prices in a
+    sorted list (bids negated, so the best price of either side is element
+    0). A level is a FIFO queue, so the oldest order at the best price fills
+    first. Cancelled orders are only marked and subtracted from their level's
+    quantity; matching skips them, and a level is dropped as soon as its
+    open quantity reaches zero. Trades execute at the resting order's price.
+    """
+
+    def __init__(self, listing: str):
+        self.listing = listing
+        self._levels = {"buy": {}, "sell": {}}
+        self._keys = {"buy": [], "sell": []}
+        self.last_price: Optional[float] = None
+        self.volume = 0
+
+    @staticmethod
+    def _key(side: str, price: float) -> float:
+        return -price if side == "buy" else price
+
+    def best(self, side: str) -> Optional[float]:
+        """Best resting price on one side"""
+        keys = self._keys[side]
+        if not keys:
+            return None
+        return -keys[0] if side == "buy" else keys[0]
+
+    def match(self, order: Order, now: datetime) -> List[Dict]:
+        """Fill an incoming order against the opposite side, then rest or cancel the remainder"""
+        contra = "sell" if order.side == "buy" else "buy"
+        levels, keys = self._levels[contra], self._keys[contra]
+        # Opposite-side keys are ascending from the best price; stop past the limit
+        limit = None if order.price is None else self._key(contra, order.price)
+        fills = []
+
+        while order.remaining and keys:
+            key = keys[0]
+            if limit is not None and key > limit:
+                break
+            level = levels[key]
+            queue = level.orders
+            price = -key if contra == "buy" else key
+
+            while order.remaining and level.quantity:
+                maker = queue[0]
+                if not maker.remaining:
+                    queue.popleft()
+                    continue
+                quantity = min(order.remaining, maker.remaining)
+                order.remaining -= quantity
+                order.filled += quantity
+                maker.remaining -= quantity
+                maker.filled += quantity
+                level.quantity -= quantity
+                if not maker.remaining:
+                    maker.status = "filled"
+                    queue.popleft()
+                else:
+                    maker.status = "partially_filled"
+
+                buy, sell = (order, maker) if order.side == "buy" else (maker, order)
+                fills.append({
+                    "listing": self.listing,
+                    "price": price,
+                    "quantity": quantity,
+                    "buy_order_id": buy.order_id,
+                    "sell_order_id": sell.order_id,
+                    "buyer_id": buy.trader_id,
+                    "seller_id": sell.trader_id,
+                    "aggressor": order.side,
+                    "timestamp": now
+                })
+                self.last_price = price
+                self.volume += quantity
+
+            if not level.quantity:
+                del levels[key]
+                del keys[0]
+
+        if order.filled:
+            order.status = "filled" if not order.remaining else "partially_filled"
+        if order.remaining:
+            if order.price is None or order.time_in_force == "ioc":
+                order.remaining = 0
+                order.status = "cancelled"
+            else:
+                self._rest(order)
+        return fills
+
+    def _rest(self, order: Order):
+        key = self._key(order.side, order.price)
+        levels = self._levels[order.side]
+        level = levels.get(key)
+        if level is None:
+            level = levels[key] = _Level()
+            insort(self._keys[order.side], key)
+        level.orders.append(order)
+        level.quantity += order.remaining
+
+    def cancel(self, order: Order):
+        """Take a resting order's open quantity off its level"""
+        key = self._key(order.side, order.price)
+        level = self._levels[order.side][key]
+        level.quantity -= order.remaining
+        order.remaining = 0
+        order.status = "cancelled"
+        if not level.quantity:
+            keys = self._keys[order.side]
+            del self._levels[order.side][key]
+            del keys[bisect_left(keys, key)]
+
+    def depth(self, levels: int = 10) -> Dict:
+        """Aggregated open quantity of the best price levels on each side"""
+        book = {}
+        for side, name in (("buy", "bids"), ("sell", "asks")):
+            sign = -1 if side == "buy" else 1
+            side_levels = self._levels[side]
+            book[name] = [
+                {
+                    "price": sign * key,
+                    "quantity": side_levels[key].quantity,
+                    "orders": sum(1 for order in side_levels[key].orders if order.remaining)
+                }
+                for key in self._keys[side][:levels]
+            ]
+        return book
+
+    def snapshot(self, levels: int = 10) -> Dict:
+        """Top of book, spread, last trade and depth"""
+        bid, ask = self.best("buy"), self.best("sell")
+        return {
+            "listing": self.listing,
+            "best_bid": bid,
+            "best_ask": ask,
+            "spread": ask - bid if bid is not None and ask is not None else None,
+            "mid_price": (ask + bid) / 2 if bid is not None and ask is not None else None,
+            "last_price": self.last_price,
+            "volume": self.volume,
+            **self.depth(levels)
+        }
+
+
+class MatchingEngine:
+    """Order entry, cancels and market data across one order book per listing
+
+    Books are created on first use. Every open order is indexed by id, so a
+    cancel is a dict lookup plus a bisect on its side's price levels. A single
+    lock serializes order entry, which keeps the sequence of fills
+    deterministic when requests arrive from several threads.
+    """
+
+    def __init__(self):
+        self.books: Dict[str, OrderBook] = {}
+        self._orders: Dict[str, Order] = {}
+        self._ids = itertools.count(1)
+        self._lock = threading.Lock()
+
+    def book(self, listing: str) -> OrderBook:
+        book = self.books.get(listing)
+        if book is None:
+            book = self.books[listing] = OrderBook(listing)
+        return book
+
+    def submit(
+        self,
+        listing: str,
+        side: str,
+        quantity: int,
+        trader_id: str,
+        price: Optional[float] = None,
+        time_in_force: str = "gtc"
+    ) -> Dict:
+        """Match a new order; returns the order and its fills in execution order"""
+        if side not in SIDES:
+            raise ValueError(f"Unknown side {side}, expected one of {', '.join(SIDES)}")
+        if time_in_force not in TIME_IN_FORCE:
+            raise ValueError(f"Unknown time in force {time_in_force}, expected one of {', '.join(TIME_IN_FORCE)}")
+        if quantity <= 0:
+            raise ValueError("Order quantity must be positive")
+        if price is not None and (not math.isfinite(price) or price <= 0):
+            raise ValueError("Limit price must be a positive finite number")
+
+        with self._lock:
+            order = Order(f"ORD_{next(self._ids):08d}", listing, side, price, quantity, trader_id, time_in_force)
+            fills = self.book(listing).match(order, order.timestamp)
+            if order.remaining:
+                self._orders[order.order_id] = order
+            for fill in fills:
+                maker_id = fill["sell_order_id"] if side == "buy" else fill["buy_order_id"]
+                maker = self._orders.get(maker_id)
+                if maker is not None and not maker.remaining:
+                    del self._orders[maker_id]
+        return {"order": order, "fills": fills}
+
+    def cancel(self, order_id: str) -> Order:
+        """Cancel the open quantity of a resting order; raises KeyError if it is not open"""
+        with self._lock:
+            order = self._orders.pop(order_id)
+            self.books[order.listing].cancel(order)
+        return order
+
+    def order(self, order_id: str) -> Optional[Order]:
+        """An open order by id"""
+        return self._orders.get(order_id)
+
+    def snapshot(self, listing: str, levels: int = 10) -> Dict:
+        with self._lock:
+            return self.book(listing).snapshot(levels)
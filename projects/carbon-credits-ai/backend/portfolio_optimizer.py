@@ -0,0 +1,309 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Portfolio Optimizer
+Budget-constrained credit allocation with diversification caps
+"""
+
+import os
+import time
+from typing import Dict, Optional
+
+import numpy as np
+
+DEFAULT_TIME_LIMIT_MS = float(os.environ.get("CARBON_OPTIMIZER_TIME_LIMIT_MS", 50))
+
+# Relative gap below which an allocation counts as optimal
+DEFAULT_TOLERANCE = 1e-6
+
+# Slack for float comparisons against budgets
+EPSILON = 1e-9
+
+
+class PortfolioOptimizer:
+    """Integer allocation of a budget across carbon credits
+
+    Maximizes the score-weighted spend sum(q_i * cost_i * score_i) subject to
+    the total budget, each credit's available volume, an optional cap on the
+    share of the budget spent on one credit and caps on the spend per credit
+    type. Quantities are whole tons.
+
+    1. The LP relaxation is solved exactly: every constraint is either a
+       per-credit bound, a per-type cap or the budget, and these nest, so
+       filling credits in score order up to the tightest remaining cap is
+       optimal. It is computed with sorted cumulative sums in NumPy and gives
+       an upper bound on the integer optimum.
+    2. The LP solution is rounded down to whole tons and leftover budget is
+       refilled in score order, giving a feasible incumbent.
+    3. A local search gives back one ton of a low-scoring credit and refills
+       with the freed money while that improves the allocation.
+    4. Depth-first branch and bound over credits in score order, pruned with
+       the LP bound of the remaining credits, either proves the incumbent
+       optimal or replaces it with better allocations.
+
+    Phases 3 and 4 stop at the time limit and keep the best allocation found
+    so far. The result reports the LP bound and the remaining optimality gap.
+    """
+
+    def __init__(self, time_limit_ms: Optional[float] = None, tolerance: float = DEFAULT_TOLERANCE):
+        self.time_limit_ms = DEFAULT_TIME_LIMIT_MS if time_limit_ms is None else time_limit_ms
+        self.tolerance = tolerance
+
+    def solve(
+        self,
+        costs: np.ndarray,
+        scores: np.ndarray,
+        volumes: np.ndarray,
+        types: np.ndarray,
+        budget: float,
+        max_position_share: Optional[float] = None,
+        max_type_share: Optional[float] = None,
+        type_caps: Optional[Dict[str, float]] = None,
+        time_limit_ms: Optional[float] = None
+    ) -> Dict:
+        """Allocate a budget; returns whole-ton quantities aligned with the inputs"""
+        started = time.perf_counter()
+        limit_ms = self.time_limit_ms if time_limit_ms is None else time_limit_ms
+        deadline = started + limit_ms / 1000
+
+        costs = np.asarray(costs, dtype=float)
+        scores = np.asarray(scores, dtype=float)
+        volumes = np.asarray(volumes, dtype=np.int64)
+        type_names, type_codes = np.unique(np.asarray(types), return_inverse=True)
+        type_codes = type_codes.ravel()
+
+        # Spend bounds: per credit from volume and position share, per type from the caps
+        unit_bounds = np.where(costs > 0, volumes, 0)
+        if max_position_share is not None:
+            unit_bounds = np.minimum(unit_bounds, np.floor(max_position_share * budget / np.where(costs > 0, costs, 1) + EPSILON))
+        unit_bounds = unit_bounds.astype(np.int64)
+
+        type_limits = np.full(len(type_names), float(budget))
+        if max_type_share is not None:
+            type_limits = np.minimum(type_limits, max_type_share * budget)
+        for name, cap in (type_caps or {}).items():
+            type_limits[type_names == name] = np.minimum(type_limits[type_names == name], cap)
+
+        order = np.argsort(-scores, kind="stable")
+        spend_lp = self._solve_relaxation(order, costs * unit_bounds, type_codes, type_limits, budget)
+        upper_bound = float(np.dot(spend_lp, scores))
+
+        quantities = np.floor(spend_lp / np.where(costs > 0, costs, 1) + EPSILON).astype(np.int64)
+        quantities = np.minimum(quantities, unit_bounds)
+        state = _State(costs, scores, unit_bounds, type_codes, type_limits, budget, quantities)
+        state.refill(order)
+
+        improvements, nodes = 0, 0
+        if not self._within_tolerance(state.objective(), upper_bound):
+            improvements = self._improve(state, order, deadline)
+        if self._within_tolerance(state.objective(), upper_bound):
+            status = "optimal"
+        else:
+            status, nodes = self._branch_and_bound(state, order, type_limits, budget, deadline)
+
+        objective = state.objective()
+        return {
+            "quantities": state.quantities,
+            "objective": objective,
+            "upper_bound": upper_bound,
+            "gap": max((upper_bound - objective) / upper_bound, 0.0) if upper_bound > 0 else 0.0,
+            "status": status,
+            "improvements": improvements,
+            "nodes": nodes,
+            "elapsed_ms": (time.perf_counter() - started) * 1000
+        }
+
+    def _within_tolerance(self, value: float, bound: float) -> bool:
+        return bound <= value * (1 + self.tolerance) + EPSILON
+
+    @staticmethod
+    def _solve_relaxation(order: np.ndarray, spend_bounds: np.ndarray, type_codes: np.ndarray,
+                          type_limits: np.ndarray, budget: float) -> np.ndarray:
+        """Exact LP optimum: fill in score order, first against type caps, then against the budget"""
+        bounds = spend_bounds[order]
+        codes = type_codes[order]
+
+        # Spend before each credit among earlier credits of the same type
+        by_type = np.argsort(codes, kind="stable")
+        bounds_by_type = bounds[by_type]
+        cumulative = np.cumsum(bounds_by_type)
+        group_starts = np.r_[0, np.flatnonzero(np.diff(codes[by_type])) + 1]
+        group_offsets = np.repeat(cumulative[group_starts] - bounds_by_type[group_starts], np.diff(np.r_[group_starts, len(codes)]))
+        before_in_type = cumulative - bounds_by_type - group_offsets
+        capped = np.empty_like(bounds)
+        capped[by_type] = np.clip(type_limits[codes[by_type]] - before_in_type, 0, bounds_by_type)
+
+        # Then the same against the overall budget
+        before = np.cumsum(capped) - capped
+        spend = np.empty_like(bounds)
+        spend[order] = np.clip(budget - before, 0, capped)
+        return spend
+
+    @staticmethod
+    def _improve(state: "_State", order: np.ndarray, deadline: float) -> int:
+        """Local search: give back one ton of a weak credit and refill"""
+        improvements = 0
+        while True:
+            improved = False
+            held = [i for i in order[::-1] if state.quantities[i] > 0]
+            for i in held:
+                if time.perf_counter() >= deadline:
+                    return improvements
+                candidate = state.copy()
+                candidate.take(i, -1)
+                candidate.refill(order, skip=i)
+                if candidate.objective() > state.objective() + EPSILON:
+                    state.assign(candidate)
+                    improvements += 1
+                    improved = True
+                    break
+            if not improved:
+                return improvements
+
+    def _branch_and_bound(self, state: "_State", order: np.ndarray, type_limits: np.ndarray,
+                          budget: float, deadline: float):
+        """Depth-first search over whole-ton quantities in score order, largest quantity first
+
+        A node fixes the quantities of the first k credits; its bound is the
+        fixed value plus the LP optimum of the rest. Lowering a credit's
+        quantity never raises that bound, because the freed money can only go
+        to lower-scoring credits, so once a quantity is pruned all smaller
+        ones are too.
+        """
+        costs = state.costs[order].tolist()
+        values = (state.costs * state.scores)[order].tolist()
+        scores = state.scores[order].tolist()
+        bounds = state.unit_bounds[order].tolist()
+        codes = state.type_codes[order].tolist()
+        n = len(costs)
+        suffix_min_cost = np.minimum.accumulate(np.r_[np.where(state.unit_bounds[order] > 0, state.costs[order], np.inf), np.inf][::-1])[::-1].tolist()
+
+        def relaxation(k: int, remaining: float, type_remaining: list) -> float:
+            type_remaining = list(type_remaining)
+            total = 0.0
+            for j in range(k, n):
+                if remaining <= EPSILON:
+                    break
+                spend = min(bounds[j] * costs[j], type_remaining[codes[j]], remaining)
+                if spend > 0:
+                    total += spend * scores[j]
+                    remaining -= spend
+                    type_remaining[codes[j]] -= spend
+            return total
+
+        best = state.objective()
+        best_quantities = None
+        quantities = [0] * n
+        remaining = float(budget)
+        type_remaining = type_limits.tolist()
+        value = 0.0
+        stack = []  # [position, quantity] frames of the current path
+        nodes = 0
+        k = 0
+
+        while True:
+            nodes += 1
+            if nodes % 32 == 0 and time.perf_counter() >= deadline:
+                status = "time_limit"
+                break
+
+            pruned = False
+            if k >= n or remaining < suffix_min_cost[k] - EPSILON:
+                if value > best + EPSILON:
+                    best, best_quantities = value, list(quantities)
+                descend = False
+            else:
+                descend = not self._within_tolerance(best, value + relaxation(k, remaining, type_remaining))
+                pruned = not descend
+
+            if descend:
+                quantity = bounds[k]
+                if costs[k] > 0:
+                    headroom = min(remaining, type_remaining[codes[k]])
+                    quantity = min(quantity, int(headroom / costs[k] + EPSILON))
+                quantity = max(quantity, 0)
+                quantities[k] = quantity
+                remaining -= quantity * costs[k]
+                type_remaining[codes[k]] -= quantity * costs[k]
+                value += quantity * values[k]
+                stack.append([k, quantity])
+                k += 1
+                continue
+
+            # Backtrack to the deepest credit whose quantity can still be lowered
+            while stack:
+                j, quantity = stack[-1]
+                if quantity > 0 and not (pruned and j == k - 1):
+                    quantities[j] = quantity - 1
+                    remaining += costs[j]
+                    type_remaining[codes[j]] += costs[j]
+                    value -= values[j]
+                    stack[-1][1] = quantity - 1
+                    k = j + 1
+                    break
+                quantities[j] = 0
+                remaining += quantity * costs[j]
+                type_remaining[codes[j]] += quantity * costs[j]
+                value -= quantity * values[j]
+                stack.pop()
+                pruned = False
+            else:
+                status = "optimal"
+                break
+
+        if best_quantities is not None:
+            improved = np.empty(n, dtype=np.int64)
+            improved[order] = best_quantities
+            state.assign(_State(state.costs, state.scores, state.unit_bounds, state.type_codes,
+                                type_limits, budget, improved))
+        return status, nodes
+
+
+class _State:
+    """Integer allocation with its remaining budget and per-type headroom"""
+
+    def __init__(self, costs, scores, unit_bounds, type_codes, type_limits, budget, quantities):
+        self.costs = costs
+        self.scores = scores
+        self.unit_bounds = unit_bounds
+        self.type_codes = type_codes
+        self.quantities = quantities
+        spend = quantities * costs
+        self.remaining = budget - spend.sum()
+        self.type_remaining = type_limits - np.bincount(type_codes, weights=spend, minlength=len(type_limits))
+
+    def copy(self) -> "_State":
+        clone = object.__new__(_State)
+        clone.__dict__.update(self.__dict__)
+        clone.quantities = self.quantities.copy()
+        clone.type_remaining = self.type_remaining.copy()
+        return clone
+
+    def assign(self, other: "_State"):
+        self.quantities = other.quantities
+        self.remaining = other.remaining
+        self.type_remaining = other.type_remaining
+
+    def objective(self) -> float:
+        return float(np.dot(self.quantities * self.costs, self.scores))
+
+    def take(self, i: int, units: int):
+        spend = units * self.costs[i]
+        self.quantities[i] += units
+        self.remaining -= spend
+        self.type_remaining[self.type_codes[i]] -= spend
+
+    def refill(self, order: np.ndarray, skip: Optional[int] = None):
+        """Spend leftover budget on whole tons in score order"""
+        costs = self.costs
+        for i in order:
+            if self.remaining < costs[i] - EPSILON:
+                continue
+            if i == skip or costs[i] <= 0:
+                continue
+            spare = self.unit_bounds[i] - self.quantities[i]
+            if spare <= 0:
+                continue
+            headroom = min(self.remaining, self.type_remaining[self.type_codes[i]])
+            units = min(spare, int(np.floor(headroom / costs[i] + EPSILON)))
+            if units > 0:
+                self.take(i, units)
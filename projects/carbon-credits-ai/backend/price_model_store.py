@@ -0,0 +1,104 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Price Model Store
+Persists the fitted price prediction model with versioned metadata
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import joblib
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "price_model.joblib"
+METADATA_FILE = "metadata.json"
+
+
+def config_hash(config: Dict) -> str:
+    """Digest of PRICE_MODEL_CONFIG that names the entry of the model fitted with it
+
+    Keys are sorted before hashing, so reordering the config keeps the digest.
+    """
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class PriceModelStore:
+    """Fitted credit price models on disk, one directory per config digest
+
+    Each entry holds the pickled regressor and a metadata file with the
+    digest, save time and training stats. Only the entry of the current
+    config is kept. Models are written uncompressed, so `load` can memory-map their arrays
+    read-only instead of copying the file into each process. scikit-learn
+    still copies tree nodes into its own buffers on unpickling; those pages
+    are shared between workers when the model is loaded before they fork
+    (e.g. gunicorn --preload), since inference never writes to them.
+    """
+
+    def __init__(self, root: Optional[str] = None):
+        default_root = Path(__file__).resolve().parent / "model_store"
+        self.root = Path(root or os.environ.get("CARBON_MODEL_DIR", default_root))
+
+    def _entry_dir(self, digest: str) -> Path:
+        return self.root / digest
+
+    def has(self, digest: str) -> bool:
+        """Whether the model and its metadata were both saved for this digest"""
+        entry = self._entry_dir(digest)
+        return all((entry / name).exists() for name in (MODEL_FILE, METADATA_FILE))
+
+    def metadata(self, digest: str) -> Optional[Dict]:
+        """Training stats saved with a model, or None if it was never saved"""
+        path = self._entry_dir(digest) / METADATA_FILE
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, digest: str, model, metadata: Optional[Dict] = None) -> Path:
+        """Persist a fitted model under its digest, replacing an older save of it"""
+        entry = self._entry_dir(digest)
+        self.root.mkdir(parents=True, exist_ok=True)
+
+        # Dot-prefixed until both files are written: `has` never matches it and
+        # pruning skips it, and the rename into place swaps the whole entry at once
+        staging = Path(tempfile.mkdtemp(prefix=f".{digest}-", dir=self.root))
+        try:
+            joblib.dump(model, staging / MODEL_FILE)
+            with open(staging / METADATA_FILE, "w") as f:
+                json.dump({
+                    "config_hash": digest,
+                    "saved_at": datetime.now().isoformat(),
+                    **(metadata or {})
+                }, f, indent=2, default=str)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(staging, entry)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._prune_stale(digest)
+        return entry
+
+    def load(self, digest: str) -> Tuple[object, Dict]:
+        """Memory-mapped regressor and its training stats"""
+        entry = self._entry_dir(digest)
+        model = joblib.load(entry / MODEL_FILE, mmap_mode="r")
+        return model, self.metadata(digest)
+
+    def _prune_stale(self, digest: str):
+        """Drop models fitted under earlier configs; only the current one is ever loaded"""
+        for path in self.root.iterdir():
+            if path.is_dir() and path.name != digest and not path.name.startswith("."):
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"Deleted price model of outdated config {path.name}")
@@ -5,23 +5,36 @@ Simplified version for immediate demonstration
 """
 
 import json
+import operator
 import random
 import time
 from datetime import datetime, timedelta
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 
+from arbitrage_scanner import ArbitrageScanner
+from credit_store import CreditRepository
+
 # Configure Flask app
 app = Flask(__name__)
 CORS(app)
 
+ARBITRAGE_TOKENS = ["USDC", "USDT", "ETH", "BTC", "DAI"]
+ARBITRAGE_CHAINS = ["ethereum", "polygon", "bsc", "arbitrum"]
+
 class SimpleCarbonCreditsAI:
     """Simplified AI-powered carbon credit trading system"""
     
     def __init__(self):
-        self.credits = []
+        self.credits = CreditRepository(field=operator.getitem)
         self.trading_history = []
         self.optimization_history = []
+        self.arbitrage = ArbitrageScanner(
+            tokens=ARBITRAGE_TOKENS,
+            chains=ARBITRAGE_CHAINS,
+            base_prices=[100 if token in ["USDC", "USDT", "DAI"] else 2000 if token == "ETH" else 45000
+                         for token in ARBITRAGE_TOKENS]
+        )
         self._initialize_sample_data()
         
     def _initialize_sample_data(self):
@@ -45,7 +58,7 @@ class SimpleCarbonCreditsAI:
                 "co2_tons": random.uniform(0.5, 10.0),
                 "timestamp": datetime.now() - timedelta(days=random.randint(0, 30))
             }
-            self.credits.append(credit)
+            self.credits.add(credit)
     
     def _get_base_price_for_type(self, credit_type):
         """Get base price for different credit types"""
@@ -61,10 +74,10 @@ class SimpleCarbonCreditsAI:
         """AI-powered portfolio optimization"""
         try:
             # Filter credits by sustainability goals
-            available_credits = []
-            for credit in self.credits:
-                if credit["type"] in sustainability_goals or not sustainability_goals:
-                    available_credits.append(credit)
+            if sustainability_goals:
+                available_credits = self.credits.find(type=sustainability_goals)
+            else:
+                available_credits = self.credits.all()
             
             if not available_credits:
                 return {"error": "No credits match sustainability goals"}
@@ -133,46 +146,14 @@ class SimpleCarbonCreditsAI:
     
     def find_arbitrage_opportunities(self):
         """Find cross-chain arbitrage opportunities"""
-        opportunities = []
-        
-        # Simulate arbitrage opportunities
-        tokens = ["USDC", "USDT", "ETH", "BTC", "DAI"]
-        chains = ["ethereum", "polygon", "bsc", "arbitrum"]
-        
-        for token in tokens:
-            if random.random() > 0.7:  # 30% chance of opportunity
-                prices = {}
-                for chain in chains:
-                    base_price = 100 if token in ["USDC", "USDT", "DAI"] else 2000 if token == "ETH" else 45000
-                    prices[chain] = base_price * (1 + random.uniform(-0.02, 0.02))
-                
-                min_price_chain = min(prices, key=prices.get)
-                max_price_chain = max(prices, key=prices.get)
-                price_diff = ((prices[max_price_chain] - prices[min_price_chain]) / prices[min_price_chain]) * 100
-                
-                if price_diff > 1.0:
-                    gas_cost = random.uniform(50, 200)
-                    trade_amount = 10000
-                    profit_potential = trade_amount * (price_diff / 100)
-                    net_profit = profit_potential - gas_cost
-                    
-                    if net_profit > 100:
-                        opportunities.append({
-                            "token": token,
-                            "chain_a": min_price_chain,
-                            "chain_b": max_price_chain,
-                            "price_diff": price_diff,
-                            "profit_potential": profit_potential,
-                            "gas_cost": gas_cost,
-                            "net_profit": net_profit
-                        })
-        
-        return opportunities[:10]
+        # Simulate one market tick, then scan every token on every chain pair
+        self.arbitrage.tick()
+        return self.arbitrage.scan(top_k=10, min_spread_pct=1.0, min_net_profit=100)
     
     def execute_trade(self, credit_id, quantity, buyer_id, price_per_ton):
         """Execute a carbon credit trade"""
         try:
-            credit = next((c for c in self.credits if c["id"] == credit_id), None)
+            credit = self.credits.get(credit_id)
             if not credit:
                 return {"error": "Carbon credit not found"}
             
@@ -233,7 +214,7 @@ def get_carbon_credits():
     """Get all available carbon credits"""
     return {
         "success": True,
-        "credits": carbon_ai.credits,
+        "credits": carbon_ai.credits.all(),
         "total_count": len(carbon_ai.credits)
     }
 
@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+CarbonCredits AI - Trade Journal
+Append-only trade log in SQLite with the most recent trades kept in memory
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import deque
+from itertools import islice
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class TradeJournal:
+    """Durable, append-only trade history
+
+    Trades are written to a SQLite database in WAL mode, keyed by a
+    monotonically increasing sequence number with an index on the trade time,
+    and the newest ones are also kept in a fixed-size ring buffer. Memory
+    stays flat no matter how many trades are recorded, history survives
+    restarts, and the common "latest trades" read never touches the disk.
+
+    Several server processes may share one journal. Sequence numbers are
+    assigned inside SQLite's write lock, and a process that finds trades it
+    did not write pulls them into its ring buffer before using it, so the
+    buffer always holds a contiguous tail of the log.
+
+    Pages run backwards from the newest trade: the cursor is the sequence
+    number of the oldest trade on the previous page, and trades within a page
+    are in chronological order.
+    """
+
+    def __init__(self, path: Optional[str] = None, recent_size: Optional[int] = None):
+        default_path = Path(__file__).resolve().parent / "data" / "trades.db"
+        self.path = Path(path or os.environ.get("CARBON_TRADE_JOURNAL", default_path))
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        size = recent_size or int(os.environ.get("CARBON_RECENT_TRADES", 1000))
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.execute("PRAGMA synchronous=NORMAL")
+        self._db.execute(
+            "CREATE TABLE IF NOT EXISTS trades ("
+            "seq INTEGER PRIMARY KEY, trade_id TEXT NOT NULL UNIQUE, "
+            "timestamp REAL NOT NULL, record TEXT NOT NULL)"
+        )
+        self._db.execute("CREATE INDEX IF NOT EXISTS trades_timestamp ON trades (timestamp)")
+        self._db.commit()
+
+        self._recent = deque(maxlen=size)
+        self._recent_seqs = deque(maxlen=size)
+        rows = self._db.execute("SELECT seq, record FROM trades ORDER BY seq DESC LIMIT ?", (size,)).fetchall()
+        for seq, record in reversed(rows):
+            self._recent.append(self._decode(record))
+            self._recent_seqs.append(seq)
+        self._last_seq = rows[0][0] if rows else 0
+
+        if self._last_seq:
+            logger.info(f"Opened trade journal {self.path} with {self._last_seq} trades")
+
+    def __len__(self) -> int:
+        return self._last_seq
+
+    @staticmethod
+    def _decode(record: str) -> Dict:
+        trade = json.loads(record)
+        trade["timestamp"] = datetime.fromisoformat(trade["timestamp"])
+        return trade
+
+    def _catch_up(self):
+        """Pull trades appended by other processes into the ring buffer; call with the lock held"""
+        rows = self._db.execute(
+            "SELECT seq, record FROM trades WHERE seq > ? ORDER BY seq", (self._last_seq,)
+        ).fetchall()
+        for seq, record in rows[-self._recent.maxlen:]:
+            self._recent.append(self._decode(record))
+            self._recent_seqs.append(seq)
+        if rows:
+            self._last_seq = rows[-1][0]
+
+    def append(self, record: Dict) -> Dict:
+        """Assign the next trade id, persist the trade and return it"""
+        with self._lock:
+            # The write lock makes reading the last sequence number and inserting atomic across processes
+            self._db.execute("BEGIN IMMEDIATE")
+            try:
+                seq = self._db.execute("SELECT COALESCE(MAX(seq), 0) + 1 FROM trades").fetchone()[0]
+                trade = {"trade_id": f"TRADE_{seq:06d}", **record}
+                timestamp = trade.setdefault("timestamp", datetime.now())
+                self._db.execute(
+                    "INSERT INTO trades (seq, trade_id, timestamp, record) VALUES (?, ?, ?, ?)",
+                    (seq, trade["trade_id"], timestamp.timestamp(), json.dumps(trade, default=str))
+                )
+                if seq != self._last_seq + 1:
+                    self._catch_up()
+                self._db.commit()
+            except BaseException:
+                self._db.rollback()
+                raise
+            if seq > self._last_seq:
+                self._last_seq = seq
+                self._recent.append(trade)
+                self._recent_seqs.append(seq)
+        return trade
+
+    def page(
+        self,
+        limit: int = 20,
+        cursor: Optional[int] = None,
+        start: Optional[datetime] = None,
+        end: Optional[datetime] = None
+    ) -> Dict:
+        """Up to `limit` trades older than the cursor, optionally within [start, end]"""
+        with self._lock:
+            self._catch_up()
+            before = cursor if cursor is not None else self._last_seq + 1
+            # Sequence numbers are contiguous, so a page inside the ring buffer is a slice of it
+            before = max(min(before, self._last_seq + 1), 1)
+            first = max(before - limit, 1)
+            if start is None and end is None and self._recent_seqs and first >= self._recent_seqs[0]:
+                offset = self._recent_seqs[0]
+                recent = list(islice(self._recent, first - offset, before - offset))
+                page = list(zip(range(first, before), recent))
+            else:
+                query = "SELECT seq, record FROM trades WHERE seq < ?"
+                params: list = [before]
+                if start is not None:
+                    query += " AND timestamp >= ?"
+                    params.append(start.timestamp())
+                if end is not None:
+                    query += " AND timestamp <= ?"
+                    params.append(end.timestamp())
+                query += " ORDER BY seq DESC LIMIT ?"
+                params.append(limit)
+                rows = self._db.execute(query, params).fetchall()
+                page = [(seq, self._decode(record)) for seq, record in reversed(rows)]
+
+        next_cursor = page[0][0] if page and len(page) == limit and page[0][0] > 1 else None
+        return {
+            "trades": [trade for _, trade in page],
+            "next_cursor": next_cursor
+        }
+
+    def close(self):
+        with self._lock:
+            self._db.close()
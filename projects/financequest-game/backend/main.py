@@ -4,16 +4,116 @@ import random
 import json
 from datetime import datetime, timedelta
 import math
+import numpy as np
 
 app = Flask(__name__)
 CORS(app)
 
+# Daily price swing per asset class; bonds do not move
+MARKET_VOLATILITY = {"stocks": 0.05, "crypto": 0.08, "bonds": 0.0}
+
+# Asset types accepted by the buy endpoint, singular or as the market tab name
+ASSET_TYPES = {"stock": "stocks", "stocks": "stocks", "crypto": "crypto", "bond": "bonds", "bonds": "bonds"}
+
+class MarketRegistry:
+    # Every tradable asset across stocks, crypto and bonds: a symbol -> position hash index
+    # for O(1) lookups, with prices and daily changes held in NumPy arrays so market moves
+    # and portfolio revaluations are single vectorized passes however many tickers are listed
+    
+    def __init__(self, markets, volatility=MARKET_VOLATILITY):
+        self.asset_classes = list(markets)
+        self.class_volatility = volatility
+        self.assets = []
+        self.index = {}
+        self.rng = np.random.default_rng()
+        prices, changes, classes = [], [], []
+        for asset_class, assets in markets.items():
+            for asset in assets:
+                if asset["symbol"] in self.index:
+                    raise ValueError(f"Duplicate symbol {asset['symbol']}")
+                self.index[asset["symbol"]] = len(self.assets)
+                self.assets.append(self._describe(asset))
+                prices.append(asset["price"])
+                changes.append(asset.get("change", 0.0))
+                classes.append(self.asset_classes.index(asset_class))
+        
+        self.prices = np.array(prices, dtype=float)
+        self.changes = np.array(changes, dtype=float)
+        self.class_codes = np.array(classes, dtype=np.int8)
+        self.volatility = np.array([volatility.get(name, 0.0) for name in self.asset_classes])[self.class_codes]
+    
+    @staticmethod
+    def _describe(asset):
+        # Static fields of an asset; prices and changes live in the arrays
+        return {key: value for key, value in asset.items() if key not in ("price", "change")}
+    
+    def __len__(self):
+        return len(self.assets)
+    
+    def __contains__(self, symbol):
+        return symbol in self.index
+    
+    def get(self, symbol, asset_class=None):
+        position = self.index.get(symbol)
+        if position is None:
+            return None
+        if asset_class is not None and self.asset_classes[self.class_codes[position]] != asset_class:
+            return None
+        return {
+            **self.assets[position],
+            "price": float(self.prices[position]),
+            "change": float(self.changes[position]),
+            "asset_class": self.asset_classes[self.class_codes[position]]
+        }
+    
+    def add(self, asset_class, asset):
+        if asset["symbol"] in self.index:
+            raise ValueError(f"Duplicate symbol {asset['symbol']}")
+        if asset_class not in self.asset_classes:
+            self.asset_classes.append(asset_class)
+        code = self.asset_classes.index(asset_class)
+        self.index[asset["symbol"]] = len(self.assets)
+        self.assets.append(self._describe(asset))
+        self.prices = np.append(self.prices, float(asset["price"]))
+        self.changes = np.append(self.changes, float(asset.get("change", 0.0)))
+        self.class_codes = np.append(self.class_codes, np.int8(code))
+        self.volatility = np.append(self.volatility, self.class_volatility.get(asset_class, 0.0))
+    
+    def update(self):
+        # Simulate market movements for every asset at once
+        change_percent = self.rng.uniform(-1, 1, len(self.assets)) * self.volatility
+        self.changes = np.where(self.volatility > 0, self.prices * change_percent, 0.0)
+        self.prices = np.maximum(1, self.prices + self.changes)
+    
+    def positions(self, symbols):
+        # Price array positions of the given symbols, -1 for unknown ones
+        return np.fromiter((self.index.get(symbol, -1) for symbol in symbols), dtype=np.intp, count=len(symbols))
+    
+    def value(self, positions, quantities, owners=None, count=1):
+        # Market value of holdings; with owner codes, one total per owner from a single pass
+        prices = np.where(positions >= 0, self.prices[positions], 0.0)
+        holdings_value = np.asarray(quantities, dtype=float) * prices
+        if owners is None:
+            return float(holdings_value.sum())
+        return np.bincount(owners, weights=holdings_value, minlength=count)
+    
+    def snapshot(self):
+        # Market grouped by asset class, in the shape the frontend renders
+        market = {name: [] for name in self.asset_classes}
+        for asset, price, change, code in zip(self.assets, self.prices.tolist(), self.changes.tolist(), self.class_codes.tolist()):
+            market[self.asset_classes[code]].append({**asset, "price": price, "change": change})
+        return market
+
 class FinanceQuestGame:
     def __init__(self):
         self.players = {}
         self.quests = self._initialize_quests()
-        self.market_data = self._initialize_market()
+        self.market = MarketRegistry(self._initialize_market())
         self.achievements = self._initialize_achievements()
+    
+    @property
+    def market_data(self):
+        return self.market.snapshot()
         
     def _initialize_quests(self):
         return {
@@ -129,28 +229,21 @@ class FinanceQuestGame:
         return self.players.get(player_id)
     
     def update_market(self):
-        # Simulate market movements
-        for stock in self.market_data["stocks"]:
-            change_percent = random.uniform(-0.05, 0.05)
-            stock["change"] = stock["price"] * change_percent
-            stock["price"] = max(1, stock["price"] + stock["change"])
-        
-        for crypto in self.market_data["crypto"]:
-            change_percent = random.uniform(-0.08, 0.08)
-            crypto["change"] = crypto["price"] * change_percent
-            crypto["price"] = max(1, crypto["price"] + crypto["change"])
+        self.market.update()
+        self._update_portfolio_values(self.players.values())
     
     def buy_investment(self, player_id, asset_type, symbol, quantity):
         player = self.get_player(player_id)
         if not player:
             return {"success": False, "error": "Player not found"}
         
-        # Find the asset
-        asset = None
-        if asset_type == "stock":
-            asset = next((s for s in self.market_data["stocks"] if s["symbol"] == symbol), None)
-        elif asset_type == "crypto":
-            asset = next((c for c in self.market_data["crypto"] if c["symbol"] == symbol), None)
+        # Find the asset; the asset type is optional since symbols are unique across the market.
+        # Both come straight from the JSON body, so lists or objects must not reach the dict lookups
+        if asset_type is not None and (not isinstance(asset_type, str) or asset_type not in ASSET_TYPES):
+            return {"success": False, "error": "Unknown asset type"}
+        if not isinstance(symbol, str):
+            return {"success": False, "error": "Asset not found"}
+        asset = self.market.get(symbol, ASSET_TYPES.get(asset_type))
         
         if not asset:
             return {"success": False, "error": "Asset not found"}
@@ -191,22 +284,21 @@ class FinanceQuestGame:
         }
     
     def _update_portfolio_value(self, player):
-        total_value = 0
-        for symbol, investment in player["investments"].items():
-            # Find current price
-            current_price = 0
-            for stock in self.market_data["stocks"]:
-                if stock["symbol"] == symbol:
-                    current_price = stock["price"]
-                    break
-            for crypto in self.market_data["crypto"]:
-                if crypto["symbol"] == symbol:
-                    current_price = crypto["price"]
-                    break
-            
-            total_value += investment["quantity"] * current_price
+        self._update_portfolio_values([player])
+    
+    def _update_portfolio_values(self, players):
+        # Revalue every holding of every given player in one pass over the price array
+        players = list(players)
+        symbols, quantities, owners = [], [], []
+        for owner, player in enumerate(players):
+            for symbol, investment in player["investments"].items():
+                symbols.append(symbol)
+                quantities.append(investment["quantity"])
+                owners.append(owner)
         
-        player["portfolio_value"] = total_value
+        values = self.market.value(self.market.positions(symbols), quantities, np.array(owners, dtype=np.intp), len(players))
+        for player, value in zip(players, values.tolist()):
+            player["portfolio_value"] = value
     
     def complete_quest(self, player_id, quest_id):
         player = self.get_player(player_id)
@@ -0,0 +1,177 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Portfolio Analytics
+Rolling performance metrics over an equity curve, updated incrementally
+"""
+
+import math
+import os
+from bisect import bisect_left
+from datetime import datetime, timedelta
+from typing import Dict, Optional
+
+import numpy as np
+
+LOOKBACKS = {
+    "1d": timedelta(days=1),
+    "30d": timedelta(days=30),
+    "1y": timedelta(days=365),
+    "all": None
+}
+
+SECONDS_PER_DAY = 24 * 3600
+
+# Volatility and Sharpe are computed from daily returns and annualized with this many periods;
+# markets here include crypto, which trades every calendar day
+PERIODS_PER_YEAR = int(os.environ.get("NEUROTRADE_PERIODS_PER_YEAR", 365))
+
+# Daily returns a window needs before volatility and Sharpe are reported
+MIN_DAILY_RETURNS = 2
+
+
+class RollingMetrics:
+    """Equity curve with volatility, Sharpe, drawdown and turnover kept up to date
+
+    Equity samples are appended to arrays that start small and grow by doubling, with
+    a prefix sum of traded notional. Samples arrive at irregular intervals, so
+    returns are measured on a fixed daily basis: the last equity of each UTC
+    day is its close, and prefix sums of daily returns and squared returns are
+    kept per day. Mean and variance of any lookback window then come from two
+    subtractions after a binary search, and annualizing with
+    `PERIODS_PER_YEAR` does not depend on how often equity was sampled.
+    Volatility and Sharpe are None until the window holds `MIN_DAILY_RETURNS`
+    daily returns.
+    """
+
+    def __init__(self, initial_equity: float, capacity: int = 16, started_at: Optional[datetime] = None):
+        self._times = np.empty(capacity)
+        self._equity = np.empty(capacity)
+        self._turnover_sum = np.empty(capacity)
+        self._size = 0
+        self._pending_turnover = 0.0
+
+        # Daily closes with prefix sums of their returns
+        self._days = np.empty(capacity, dtype=np.int64)
+        self._closes = np.empty(capacity)
+        self._return_sum = np.empty(capacity)
+        self._return_sq_sum = np.empty(capacity)
+        self._day_count = 0
+
+        self._peak = initial_equity
+        self.max_drawdown = 0.0
+
+        self.initial_equity = initial_equity
+        self.record_equity(initial_equity, started_at)
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record_trade(self, notional: float):
+        """Account traded notional; it is attributed to the next equity sample"""
+        self._pending_turnover += abs(notional)
+
+    def record_equity(self, equity: float, timestamp: Optional[datetime] = None):
+        """Append an equity sample, e.g. after a trade or a price update"""
+        if self._size == len(self._times):
+            self._times, self._equity, self._turnover_sum = self._grow(
+                self._size, self._times, self._equity, self._turnover_sum
+            )
+
+        i = self._size
+        now = (timestamp or datetime.now()).timestamp()
+        # Keep times monotonic so window lookups can bisect
+        self._times[i] = max(now, self._times[i - 1]) if i else now
+        self._equity[i] = equity
+        previous_turnover = self._turnover_sum[i - 1] if i else 0.0
+        self._turnover_sum[i] = previous_turnover + self._pending_turnover
+        self._pending_turnover = 0.0
+        self._record_close(int(self._times[i] // SECONDS_PER_DAY), equity)
+
+        self._peak = max(self._peak, equity)
+        if self._peak > 0:
+            self.max_drawdown = max(self.max_drawdown, 1 - equity / self._peak)
+
+        self._size += 1
+
+    def _record_close(self, day: int, equity: float):
+        """Make the sample its day's close, opening a new day if needed"""
+        k = self._day_count
+        if k and self._days[k - 1] == day:
+            k -= 1
+        else:
+            if k == len(self._days):
+                self._days, self._closes, self._return_sum, self._return_sq_sum = self._grow(
+                    k, self._days, self._closes, self._return_sum, self._return_sq_sum
+                )
+            self._day_count += 1
+
+        self._days[k] = day
+        self._closes[k] = equity
+        daily_return = 0.0
+        if k and self._closes[k - 1] > 0:
+            daily_return = equity / self._closes[k - 1] - 1
+        self._return_sum[k] = (self._return_sum[k - 1] if k else 0.0) + daily_return
+        self._return_sq_sum[k] = (self._return_sq_sum[k - 1] if k else 0.0) + daily_return * daily_return
+
+    @staticmethod
+    def _grow(size: int, *arrays: np.ndarray) -> tuple:
+        grown = []
+        for array in arrays:
+            larger = np.empty(2 * len(array), dtype=array.dtype)
+            larger[:size] = array[:size]
+            grown.append(larger)
+        return tuple(grown)
+
+    def snapshot(self, lookback: str = "all") -> Dict:
+        """Volatility, Sharpe, max drawdown and turnover over a lookback window
+
+        Volatility is the annualized standard deviation of daily returns in
+        percent and Sharpe the annualized ratio of their mean to it; both are
+        None while the window has too few daily returns.
+        """
+        if lookback not in LOOKBACKS:
+            raise ValueError(f"Unknown lookback {lookback}, expected one of {', '.join(LOOKBACKS)}")
+
+        last = self._size - 1
+        last_day = self._day_count - 1
+        window = LOOKBACKS[lookback]
+        if window is None:
+            start, start_day = 0, 0
+        else:
+            cutoff = self._times[last] - window.total_seconds()
+            start = bisect_left(self._times[:self._size], cutoff)
+            start_day = bisect_left(self._days[:self._day_count], int(cutoff // SECONDS_PER_DAY))
+
+        # Returns of the days after the window's first close
+        count = last_day - start_day
+        volatility = sharpe_ratio = None
+        if count >= MIN_DAILY_RETURNS:
+            mean = (self._return_sum[last_day] - self._return_sum[start_day]) / count
+            sq_mean = (self._return_sq_sum[last_day] - self._return_sq_sum[start_day]) / count
+            # Differences of prefix sums leave round-off noise where the true variance is zero
+            variance = max(sq_mean - mean * mean, 0.0)
+            if variance < 1e-18:
+                variance = 0.0
+            std = math.sqrt(variance)
+            volatility = std * math.sqrt(PERIODS_PER_YEAR) * 100
+            sharpe_ratio = float(mean / std * math.sqrt(PERIODS_PER_YEAR)) if std > 0 else 0.0
+
+        max_drawdown = self.max_drawdown if window is None else self._window_drawdown(start, last)
+        turnover = self._turnover_sum[last] - self._turnover_sum[start]
+        average_equity = (self._equity[start] + self._equity[last]) / 2
+
+        return {
+            "lookback": lookback,
+            "samples": last - start + 1,
+            "daily_returns": max(count, 0),
+            "volatility": volatility,
+            "sharpe_ratio": sharpe_ratio,
+            "max_drawdown": float(max_drawdown) * 100,
+            "turnover": float(turnover / average_equity) if average_equity > 0 else 0.0
+        }
+
+    def _window_drawdown(self, start: int, last: int) -> float:
+        """Max drawdown inside a window, one vectorized pass over its samples"""
+        equity = self._equity[start:last + 1]
+        peaks = np.maximum.accumulate(equity)
+        return float(np.max(1 - equity / peaks)) if len(equity) else 0.0
@@ -0,0 +1,172 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Benchmarks
+Micro-benchmarks for the hot paths of the trading backend
+
+Usage: python benchmark.py <benchmark> [--repeat N]
+"""
+
+import argparse
+import time
+
+import numpy as np
+
+
+def _timeit(fn, repeat: int) -> float:
+    """Best wall-clock time of `repeat` runs, in seconds"""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        fn()
+        best = min(best, time.perf_counter() - started)
+    return best
+
+
+def _report(name: str, baseline: float, optimized: float):
+    print(f"{name}")
+    print(f"  baseline:  {baseline * 1000:10.2f} ms")
+    print(f"  optimized: {optimized * 1000:10.2f} ms")
+    print(f"  speed-up:  {baseline / optimized:10.1f}x")
+
+
+def _legacy_training_sequences(prices, sequence_length: int, horizon: int, threshold: float):
+    """Original per-step loop, kept as the benchmark baseline"""
+    X, y = [], []
+    for i in range(sequence_length, len(prices) - horizon):
+        sequence = []
+        for j in range(i - sequence_length, i):
+            o = prices[j]
+            h = o * (1 + abs(np.random.normal(0, 0.01)))
+            l = o * (1 - abs(np.random.normal(0, 0.01)))
+            c = prices[j + 1]
+            v = np.random.uniform(1000000, 10000000)
+            sequence.append([o, h, l, c, v])
+        X.append(sequence)
+
+        future_price = prices[i + horizon]
+        current_price = prices[i]
+        if future_price > current_price * (1 + threshold):
+            y.append([1, 0, 0])
+        elif future_price < current_price * (1 - threshold):
+            y.append([0, 1, 0])
+        else:
+            y.append([0, 0, 1])
+    return np.array(X), np.array(y)
+
+
+def bench_sequences(repeat: int):
+    """Training-sequence generation: nested Python loop vs sliding window"""
+    from training import TRAINING_CONFIG, build_training_sequences, generate_sample_bars, generate_sample_prices
+
+    config = TRAINING_CONFIG
+    rng = np.random.default_rng(config["seed"])
+    prices = generate_sample_prices(100, config["samples"], rng)
+    args = (config["sequence_length"], config["horizon"], config["threshold"])
+
+    def optimized():
+        bars = generate_sample_bars(prices, rng)
+        X, y = build_training_sequences(prices, bars, *args)
+        return np.ascontiguousarray(X), y
+
+    X_old, y_old = _legacy_training_sequences(prices, *args)
+    X_new, y_new = optimized()
+    assert X_old.shape == X_new.shape and np.array_equal(y_old, y_new)
+    assert np.array_equal(X_old[:, :, [0, 3]], X_new[:, :, [0, 3]])
+
+    _report(
+        f"training sequences {X_new.shape}",
+        _timeit(lambda: _legacy_training_sequences(prices, *args), repeat),
+        _timeit(optimized, repeat)
+    )
+
+
+def bench_batch_inference(repeat: int):
+    """Signals for every symbol: model.predict per request vs one stacked batch per model"""
+    from training import SYMBOLS, TRAINING_CONFIG, build_model
+
+    models = {symbol: build_model(TRAINING_CONFIG) for symbol in SYMBOLS}
+    shape = (TRAINING_CONFIG["sequence_length"], TRAINING_CONFIG["features"])
+    windows = np.random.default_rng(0).random((len(SYMBOLS) * 4,) + shape).astype(np.float32)
+    requests = [SYMBOLS[i % len(SYMBOLS)] for i in range(len(windows))]
+
+    def per_request():
+        for symbol, window in zip(requests, windows):
+            models[symbol].predict(window[np.newaxis], verbose=0)
+
+    def batched():
+        for symbol in SYMBOLS:
+            rows = [i for i, requested in enumerate(requests) if requested == symbol]
+            models[symbol].predict_on_batch(windows[rows])
+
+    # Warm up graph tracing for both paths before timing
+    per_request()
+    batched()
+
+    _report(
+        f"batch inference ({len(requests)} requests, {len(SYMBOLS)} models)",
+        _timeit(per_request, repeat),
+        _timeit(batched, repeat)
+    )
+
+
+def _trained_sample_model():
+    """A Keras model briefly fitted on sample data, so outputs are non-trivial"""
+    from sklearn.preprocessing import MinMaxScaler
+    from training import TRAINING_CONFIG, build_model, sample_training_set
+
+    model = build_model(TRAINING_CONFIG)
+    X, y = sample_training_set("AAPL", TRAINING_CONFIG, MinMaxScaler())
+    model.fit(X, y, epochs=1, batch_size=TRAINING_CONFIG["batch_size"], verbose=0)
+    return model, np.ascontiguousarray(X, dtype=np.float32)
+
+
+def bench_parity(repeat: int):
+    """NumPy engine outputs must match Keras to float32 precision"""
+    from numpy_lstm import NumpyLSTMModel, export_weights
+
+    model, X = _trained_sample_model()
+    engine = NumpyLSTMModel(export_weights(model))
+
+    for batch in (1, 6, 64):
+        expected = model.predict_on_batch(X[:batch])
+        actual = engine.predict_on_batch(X[:batch])
+        error = float(np.max(np.abs(expected - actual)))
+        status = "ok" if error < 1e-4 else "MISMATCH"
+        print(f"parity batch={batch:<3d} max abs error {error:.2e} {status}")
+        assert error < 1e-4, f"NumPy engine diverges from Keras at batch {batch}"
+
+
+def bench_numpy_inference(repeat: int):
+    """Single-window and batched latency: Keras predict_on_batch vs NumPy engine"""
+    from numpy_lstm import NumpyLSTMModel, export_weights
+
+    model, X = _trained_sample_model()
+    engine = NumpyLSTMModel(export_weights(model))
+
+    for batch in (1, 6, 64):
+        window = X[:batch]
+        model.predict_on_batch(window)  # warm up tracing
+        _report(
+            f"inference batch={batch}",
+            _timeit(lambda: model.predict_on_batch(window), repeat * 10),
+            _timeit(lambda: engine.predict_on_batch(window), repeat * 10)
+        )
+
+
+BENCHMARKS = {
+    "sequences": bench_sequences,
+    "batch-inference": bench_batch_inference,
+    "parity": bench_parity,
+    "numpy-inference": bench_numpy_inference,
+}
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="NeuroTrade AI benchmarks")
+    parser.add_argument("benchmark", choices=sorted(BENCHMARKS) + ["all"])
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    names = sorted(BENCHMARKS) if args.benchmark == "all" else [args.benchmark]
+    for name in names:
+        BENCHMARKS[name](args.repeat)
@@ -0,0 +1,219 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Inference Serving
+Runs blocking neural network inference off the asyncio event loop
+"""
+
+import asyncio
+import functools
+import logging
+import os
+import threading
+import time
+from collections import Counter, deque
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Optional
+
+from fastapi import HTTPException
+
+logger = logging.getLogger(__name__)
+
+
+class InferenceExecutor:
+    """Bounded thread pool for blocking model inference
+
+    At most `max_workers` calls run at once and at most `max_queue_depth` more
+    wait for a worker. Anything beyond that is rejected with a 503 right away,
+    so a burst of predictions cannot pile up behind the event loop.
+
+    A call keeps its slot until the pool is done with it. If the awaiting
+    request goes away (e.g. a stream client disconnects), a call still
+    waiting for a worker is cancelled, but one already running holds its
+    slot until it returns, since a pool thread cannot be interrupted.
+    """
+
+    def __init__(self, max_workers: Optional[int] = None, max_queue_depth: Optional[int] = None):
+        self.max_workers = max_workers or int(os.environ.get("NEUROTRADE_INFERENCE_WORKERS", 2))
+        self.max_queue_depth = max_queue_depth if max_queue_depth is not None else int(
+            os.environ.get("NEUROTRADE_INFERENCE_QUEUE_DEPTH", 32)
+        )
+        self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="inference")
+        # Taken on the event loop, given back by done callbacks on pool threads
+        self._slots_lock = threading.Lock()
+        self._in_flight = 0
+        self.completed = 0
+        self.failed = 0
+        self.rejected = 0
+
+    async def run(self, fn: Callable, *args, **kwargs):
+        """Run `fn` on the pool, or fail with 503 when the queue is full"""
+        with self._slots_lock:
+            if self._in_flight >= self.max_workers + self.max_queue_depth:
+                self.rejected += 1
+                raise HTTPException(
+                    status_code=503,
+                    detail="Inference capacity exhausted, retry shortly",
+                    headers={"Retry-After": "1"}
+                )
+            self._in_flight += 1
+
+        try:
+            future = self._pool.submit(functools.partial(fn, *args, **kwargs))
+        except BaseException:
+            with self._slots_lock:
+                self._in_flight -= 1
+            raise
+        future.add_done_callback(self._release)
+        try:
+            return await asyncio.wrap_future(future)
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+
+    def _release(self, future):
+        with self._slots_lock:
+            self._in_flight -= 1
+            if future.cancelled():
+                return
+            if future.exception() is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+
+    def stats(self) -> Dict:
+        """Current load of the executor"""
+        return {
+            "max_workers": self.max_workers,
+            "max_queue_depth": self.max_queue_depth,
+            "in_flight": self._in_flight,
+            "queued": max(self._in_flight - self.max_workers, 0),
+            "completed": self.completed,
+            "failed": self.failed,
+            "rejected": self.rejected
+        }
+
+    def shutdown(self):
+        self._pool.shutdown(wait=False, cancel_futures=True)
+
+
+class MicroBatcher:
+    """Coalesces concurrent single-item requests into batched calls
+
+    Requests are collected until `max_batch_size` items are waiting or the
+    first one has waited `max_wait_ms`, then the batch runs as one call of
+    `batch_fn` on the executor and each result goes back to its caller.
+    `batch_fn` takes a list of items and returns one result per item, in
+    order; a result that is an exception is raised to that caller only.
+    """
+
+    def __init__(
+        self,
+        batch_fn: Callable,
+        executor: InferenceExecutor,
+        max_batch_size: Optional[int] = None,
+        max_wait_ms: Optional[float] = None,
+        max_pending: Optional[int] = None
+    ):
+        self.batch_fn = batch_fn
+        self.executor = executor
+        self.max_batch_size = max_batch_size or int(os.environ.get("NEUROTRADE_BATCH_MAX_SIZE", 16))
+        self.max_wait_ms = max_wait_ms if max_wait_ms is not None else float(
+            os.environ.get("NEUROTRADE_BATCH_MAX_WAIT_MS", 5)
+        )
+        self.max_pending = max_pending or int(os.environ.get("NEUROTRADE_BATCH_MAX_PENDING", 256))
+        self._queue: Optional[asyncio.Queue] = None
+        self._collector: Optional[asyncio.Task] = None
+        self._dispatches = set()
+
+        # Metrics
+        self.batch_sizes = Counter()
+        self._queue_waits = deque(maxlen=1024)
+        self.items = 0
+        self.rejected = 0
+
+    async def submit(self, item):
+        """Queue one item and wait for its result"""
+        self._ensure_started()
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self._queue.put_nowait((item, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            raise HTTPException(
+                status_code=503,
+                detail="Inference queue is full, retry shortly",
+                headers={"Retry-After": "1"}
+            )
+        return await future
+
+    def _ensure_started(self):
+        if self._collector is None or self._collector.done():
+            self._queue = asyncio.Queue(maxsize=self.max_pending)
+            self._collector = asyncio.get_running_loop().create_task(self._collect())
+
+    async def _collect(self):
+        """Form batches from the queue and hand them off without waiting for results"""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self._queue.get()]
+            deadline = loop.time() + self.max_wait_ms / 1000
+
+            while len(batch) < self.max_batch_size:
+                remaining = deadline - loop.time()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(await asyncio.wait_for(self._queue.get(), remaining))
+                except asyncio.TimeoutError:
+                    break
+
+            # Dispatch concurrently so the executor, not this loop, bounds parallelism
+            task = loop.create_task(self._dispatch(batch))
+            self._dispatches.add(task)
+            task.add_done_callback(self._dispatches.discard)
+
+    async def _dispatch(self, batch):
+        started = time.perf_counter()
+        self.batch_sizes[len(batch)] += 1
+        self.items += len(batch)
+        self._queue_waits.extend(started - enqueued for _, _, enqueued in batch)
+
+        try:
+            results = await self.executor.run(self.batch_fn, [item for item, _, _ in batch])
+        except Exception as e:
+            results = [e] * len(batch)
+
+        for (_, future, _), result in zip(batch, results):
+            if future.done():
+                continue  # caller went away
+            if isinstance(result, BaseException):
+                future.set_exception(result)
+            else:
+                future.set_result(result)
+
+    def stats(self) -> Dict:
+        """Batch-size distribution and queue-wait percentiles"""
+        batches = sum(self.batch_sizes.values())
+        waits = sorted(self._queue_waits)
+
+        def percentile(p: float) -> float:
+            if not waits:
+                return 0.0
+            return round(waits[min(int(p * len(waits)), len(waits) - 1)] * 1000, 3)
+
+        return {
+            "max_batch_size": self.max_batch_size,
+            "max_wait_ms": self.max_wait_ms,
+            "pending": self._queue.qsize() if self._queue else 0,
+            "batches": batches,
+            "items": self.items,
+            "rejected": self.rejected,
+            "mean_batch_size": round(self.items / batches, 2) if batches else 0.0,
+            "batch_size_histogram": dict(sorted(self.batch_sizes.items())),
+            "queue_wait_ms": {
+                "p50": percentile(0.50),
+                "p95": percentile(0.95),
+                "p99": percentile(0.99),
+                "max": round(waits[-1] * 1000, 3) if waits else 0.0
+            }
+        }
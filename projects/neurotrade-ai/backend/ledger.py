@@ -0,0 +1,200 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Portfolio Ledger
+Thread-safe multi-user portfolios with per-account locking
+"""
+
+import itertools
+import threading
+from collections import deque
+from datetime import datetime
+from typing import Callable, Dict, List, Optional, Set
+
+from fastapi import HTTPException
+
+from analytics import RollingMetrics
+
+
+class Account:
+    """One user's cash, positions and performance, guarded by its own lock"""
+
+    def __init__(self, user_id: str, initial_cash: float, history_size: int):
+        self.user_id = user_id
+        self.initial_cash = initial_cash
+        self.cash = initial_cash
+        self.positions: Dict[str, int] = {}
+        self.total_value = initial_cash
+        self.trade_count = 0
+        self.recent_trades = deque(maxlen=history_size)
+        self.performance = RollingMetrics(initial_cash)
+        self.lock = threading.Lock()
+
+    @property
+    def pnl(self) -> float:
+        return self.total_value - self.initial_cash
+
+    def revalue(self, price_fn: Callable[[str], Optional[float]]):
+        """Mark positions to market; caller holds the lock"""
+        total_value = self.cash
+        for symbol, quantity in self.positions.items():
+            price = price_fn(symbol)
+            if price is not None:
+                total_value += price * quantity
+        self.total_value = total_value
+
+
+class PortfolioLedger:
+    """Holds every user's portfolio keyed by user_id
+
+    Trades on different accounts run in parallel: each one only takes its own
+    account's lock. Trade ids come from one atomic counter, and a symbol index
+    lets price updates revalue only the accounts that hold the symbol.
+
+    Accounts are opened by their first trade. Reads for a user that never
+    traded are served from a shared blank account, so lookups of arbitrary
+    user ids do not allocate anything.
+    """
+
+    def __init__(
+        self,
+        portfolio_cls,
+        price_fn: Callable[[str], Optional[float]],
+        initial_cash: float = 100000.0,
+        history_size: int = 1000
+    ):
+        self.portfolio_cls = portfolio_cls
+        self.price_fn = price_fn
+        self.initial_cash = initial_cash
+        self.history_size = history_size
+        self._accounts: Dict[str, Account] = {}
+        self._accounts_lock = threading.Lock()
+        self._holders: Dict[str, Set[str]] = {}
+        self._holders_lock = threading.Lock()
+        self._trade_ids = itertools.count(1)
+        self._trade_ids_lock = threading.Lock()
+        self.trading_history = deque(maxlen=history_size)
+        self._blank = Account("", initial_cash, 0)
+
+    def account(self, user_id: str) -> Optional[Account]:
+        """An open account, or None if the user has not traded yet"""
+        return self._accounts.get(user_id)
+
+    def _open(self, user_id: str) -> Account:
+        """Get an account, opening it with the initial cash on first use"""
+        account = self._accounts.get(user_id)
+        if account is None:
+            with self._accounts_lock:
+                account = self._accounts.get(user_id)
+                if account is None:
+                    account = self._accounts[user_id] = Account(user_id, self.initial_cash, self.history_size)
+        return account
+
+    def _view(self, user_id: str) -> Account:
+        """The account to read for a user, the blank one if they never traded"""
+        return self._accounts.get(user_id) or self._blank
+
+    def _next_trade_id(self) -> str:
+        with self._trade_ids_lock:
+            return f"TRADE_{next(self._trade_ids):06d}"
+
+    @property
+    def total_trades(self) -> int:
+        return sum(account.trade_count for account in list(self._accounts.values()))
+
+    def trade_count(self, user_id: str) -> int:
+        return self._view(user_id).trade_count
+
+    def execute(self, user_id: str, symbol: str, action: str, quantity: int, price: float, order_type: str) -> Dict:
+        """Apply a filled order to an account and return the trade record"""
+        account = self._open(user_id)
+        total_cost = price * quantity
+
+        with account.lock:
+            if action == "BUY":
+                if account.cash < total_cost:
+                    raise HTTPException(status_code=400, detail="Insufficient cash")
+                account.cash -= total_cost
+                account.positions[symbol] = account.positions.get(symbol, 0) + quantity
+            elif action == "SELL":
+                if account.positions.get(symbol, 0) < quantity:
+                    raise HTTPException(status_code=400, detail="Insufficient shares")
+                account.cash += total_cost
+                account.positions[symbol] -= quantity
+                if account.positions[symbol] == 0:
+                    del account.positions[symbol]
+            else:
+                raise HTTPException(status_code=400, detail=f"Unknown action {action}")
+
+            self._update_holders(user_id, symbol, symbol in account.positions)
+
+            account.revalue(self.price_fn)
+            account.performance.record_trade(total_cost)
+            account.performance.record_equity(account.total_value)
+
+            trade_record = {
+                "trade_id": self._next_trade_id(),
+                "user_id": user_id,
+                "symbol": symbol,
+                "action": action,
+                "quantity": quantity,
+                "price": price,
+                "total_value": total_cost,
+                "timestamp": datetime.now(),
+                "order_type": order_type
+            }
+            account.trade_count += 1
+            account.recent_trades.append(trade_record)
+            portfolio = self._snapshot(account, user_id)
+
+        self.trading_history.append(trade_record)
+        return {"trade_record": trade_record, "portfolio": portfolio}
+
+    def _update_holders(self, user_id: str, symbol: str, holds: bool):
+        with self._holders_lock:
+            holders = self._holders.setdefault(symbol, set())
+            if holds:
+                holders.add(user_id)
+            else:
+                holders.discard(user_id)
+
+    def mark_to_market(self, symbol: str, timestamp: Optional[datetime] = None):
+        """Revalue the accounts holding a symbol after its price changed"""
+        with self._holders_lock:
+            user_ids = list(self._holders.get(symbol, ()))
+
+        for user_id in user_ids:
+            account = self._open(user_id)
+            with account.lock:
+                account.revalue(self.price_fn)
+                account.performance.record_equity(account.total_value, timestamp)
+
+    def portfolio(self, user_id: str):
+        """Consistent copy of an account's portfolio at current prices"""
+        account = self._view(user_id)
+        with account.lock:
+            account.revalue(self.price_fn)
+            return self._snapshot(account, user_id)
+
+    def performance(self, user_id: str, lookback: str) -> Dict:
+        account = self._view(user_id)
+        with account.lock:
+            return account.performance.snapshot(lookback)
+
+    def recent_trades(self, user_id: Optional[str] = None, limit: int = 20) -> List[Dict]:
+        """Most recent trades of one account, or across all accounts"""
+        if user_id is None:
+            trades = list(self.trading_history)
+        else:
+            account = self._view(user_id)
+            with account.lock:
+                trades = list(account.recent_trades)
+        return trades[-limit:]
+
+    def _snapshot(self, account: Account, user_id: str):
+        return self.portfolio_cls(
+            user_id=user_id,
+            cash=account.cash,
+            positions=dict(account.positions),
+            total_value=account.total_value,
+            pnl=account.pnl
+        )
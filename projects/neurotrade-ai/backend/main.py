@@ -7,21 +7,36 @@ Revolutionary AI-powered trading system with neural network predictions
 import numpy as np
 import pandas as pd
 from datetime import datetime, timedelta
-from typing import List, Dict, Optional, Tuple
+from typing import List, Dict, Optional, Tuple, Union
 import logging
 from fastapi import FastAPI, HTTPException, BackgroundTasks
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import StreamingResponse
 from pydantic import BaseModel
 import uvicorn
-import tensorflow as tf
-from sklearn.preprocessing import MinMaxScaler
 import asyncio
 import json
+import os
+import subprocess
+import sys
+import threading
+import time
+from pathlib import Path
+
+from inference import InferenceExecutor, MicroBatcher
+from ledger import PortfolioLedger
+from market_buffer import OHLCVRingBuffer
+from model_store import ModelStore, config_hash
+from signal_cache import SignalCache
+from streaming import SignalBroadcaster
+from training import SYMBOLS, TRAINING_CONFIG
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+DEMO_USER = "demo_user"
+
 # Pydantic models
 class TradingSignal(BaseModel):
     symbol: str
@@ -30,6 +45,7 @@ class TradingSignal(BaseModel):
     price: float
     timestamp: datetime
     neural_network_output: Dict
+    sequence: int = 0  # bar sequence number of the window the signal was computed from
 
 class Portfolio(BaseModel):
     user_id: str
@@ -38,12 +54,29 @@ class Portfolio(BaseModel):
     total_value: float
     pnl: float
 
+class MarketBar(BaseModel):
+    open: float
+    high: float
+    low: float
+    close: float
+    volume: float
+    timestamp: Optional[datetime] = None
+
 class TradeOrder(BaseModel):
     symbol: str
     action: str
     quantity: int
     price: float
     order_type: str  # "MARKET", "LIMIT"
+    user_id: str = DEMO_USER
+
+# "numpy" serves models with the NumPy engine so TensorFlow is only imported to train;
+# "keras" serves the Keras models directly
+INFERENCE_ENGINE = os.environ.get("NEUROTRADE_INFERENCE_ENGINE", "numpy")
+
+# Missing models are trained by the train.py job in a child process, never inline
+TRAIN_MISSING_MODELS = os.environ.get("NEUROTRADE_TRAIN_MISSING", "1") != "0"
+TRAIN_SCRIPT = Path(__file__).resolve().parent / "train.py"
 
 class NeuroTradeAI:
     """Neural network-powered trading system"""
@@ -51,172 +84,242 @@ class NeuroTradeAI:
     def __init__(self):
         self.models = {}
         self.scalers = {}
-        self.portfolio = Portfolio(
-            user_id="demo_user",
-            cash=100000.0,
-            positions={},
-            total_value=100000.0,
-            pnl=0.0
-        )
-        self.trading_history = []
+        self.ledger = PortfolioLedger(Portfolio, self._current_price, initial_cash=100000.0)
         self.market_data = {}
-        self._initialize_neural_models()
+        self.model_store = ModelStore()
+        self.model_timings = {}
+        self.bar_buffers: Dict[str, OHLCVRingBuffer] = {}
+        self.signal_cache = SignalCache()
+        self.training_job = None
         self._generate_sample_data()
+        self._initialize_neural_models()
         
     def _initialize_neural_models(self):
-        """Initialize neural network models for different assets"""
-        symbols = ["AAPL", "GOOGL", "MSFT", "TSLA", "BTC", "ETH"]
+        """Load neural network models from the store; missing or stale ones are trained in the background"""
+        digest = config_hash(TRAINING_CONFIG)
+        missing = []
         
-        for symbol in symbols:
-            # Create LSTM model for price prediction
-            model = tf.keras.Sequential([
-                tf.keras.layers.LSTM(50, return_sequences=True, input_shape=(60, 5)),
-                tf.keras.layers.Dropout(0.2),
-                tf.keras.layers.LSTM(50, return_sequences=True),
-                tf.keras.layers.Dropout(0.2),
-                tf.keras.layers.LSTM(50),
-                tf.keras.layers.Dropout(0.2),
-                tf.keras.layers.Dense(25),
-                tf.keras.layers.Dense(3)  # BUY, SELL, HOLD probabilities
-            ])
-            
-            model.compile(optimizer='adam', loss='mse', metrics=['accuracy'])
-            
-            # Train with sample data (in production, use real historical data)
-            self._train_model_with_sample_data(model, symbol)
+        for symbol in SYMBOLS:
+            started = time.perf_counter()
             
-            self.models[symbol] = model
-            self.scalers[symbol] = MinMaxScaler()
+            if not self.model_store.has(symbol, digest):
+                missing.append(symbol)
+                continue
             
-    def _train_model_with_sample_data(self, model, symbol):
-        """Train model with sample data"""
-        # Generate sample training data
-        np.random.seed(42)
-        sequence_length = 60
+            try:
+                model, scaler = self.model_store.load(symbol, digest, INFERENCE_ENGINE)
+                self._install_model(symbol, model, scaler)
+                self._record_model_timing(symbol, "store", time.perf_counter() - started)
+            except Exception as e:
+                logger.warning(f"Stored model for {symbol} could not be loaded, retraining: {e}")
+                missing.append(symbol)
         
-        # Create sample OHLCV data
-        base_price = 100 if symbol in ["AAPL", "GOOGL", "MSFT", "TSLA"] else 1000
-        prices = []
-        current_price = base_price
+        if missing:
+            if TRAIN_MISSING_MODELS:
+                self._start_training_job(missing)
+            else:
+                logger.warning(f"No stored models for {', '.join(missing)}; run train.py to create them")
+    
+    def _install_model(self, symbol: str, model, scaler):
+        """Make a model available for predictions"""
+        self.scalers[symbol] = scaler
+        self.models[symbol] = model
+        if symbol in self.bar_buffers:
+            self.bar_buffers[symbol].set_scaler(scaler)
+        self.signal_cache.invalidate(symbol)
+    
+    def _start_training_job(self, symbols: List[str]):
+        """Train models with the train.py job in a separate process and load them when done
         
-        for _ in range(1000):
-            change = np.random.normal(0, 0.02)  # 2% daily volatility
-            current_price *= (1 + change)
-            prices.append(current_price)
+        The server keeps serving the symbols it has while the job runs. The
+        symbols passed in are missing or unreadable, so the job is forced:
+        train.py's own staleness check would skip a stored but corrupt entry.
+        """
+        self.training_job = {"status": "running", "symbols": symbols, "started_at": datetime.now()}
+        command = [
+            sys.executable, str(TRAIN_SCRIPT), "--store", str(self.model_store.root), "--symbols", *symbols, "--force"
+        ]
         
-        # Create sequences
-        X, y = [], []
-        for i in range(sequence_length, len(prices) - 3):
-            sequence = []
-            for j in range(i - sequence_length, i):
-                # OHLCV data
-                o = prices[j]
-                h = o * (1 + abs(np.random.normal(0, 0.01)))
-                l = o * (1 - abs(np.random.normal(0, 0.01)))
-                c = prices[j + 1]
-                v = np.random.uniform(1000000, 10000000)
-                sequence.append([o, h, l, c, v])
+        def run():
+            started = time.perf_counter()
+            result = subprocess.run(command)
+            self.training_job["status"] = "finished" if result.returncode == 0 else "failed"
             
-            X.append(sequence)
-            
-            # Create target (BUY=0, SELL=1, HOLD=2)
-            future_price = prices[i + 3]
-            current_price = prices[i]
+            digest = config_hash(TRAINING_CONFIG)
+            for symbol in symbols:
+                if not self.model_store.has(symbol, digest):
+                    continue
+                try:
+                    model, scaler = self.model_store.load(symbol, digest, INFERENCE_ENGINE)
+                    self._install_model(symbol, model, scaler)
+                    self._record_model_timing(symbol, "trained", time.perf_counter() - started)
+                except Exception as e:
+                    logger.error(f"Failed to load trained model for {symbol}: {e}")
+        
+        logger.info(f"Training {', '.join(symbols)} in the background")
+        threading.Thread(target=run, name="model-training", daemon=True).start()
+    
+    def _record_model_timing(self, symbol: str, source: str, seconds: float):
+        """Record how a model became available and how long it took"""
+        self.model_timings[symbol] = {"source": source, "seconds": round(seconds, 3)}
+        action = "Loaded" if source == "store" else "Trained"
+        logger.info(f"{action} neural network for {symbol} in {seconds:.2f}s")
+    
+    def _generate_sample_data(self):
+        """Seed each symbol's bar history with sample market data"""
+        base_prices = {"AAPL": 150, "GOOGL": 2800, "MSFT": 300, "TSLA": 800, "BTC": 45000, "ETH": 3000}
+        window = TRAINING_CONFIG["sequence_length"]
+        
+        for symbol in SYMBOLS:
+            # Sample history around the base price (in production, backfill from a real API)
+            base_price = base_prices[symbol] + np.random.normal(0, base_prices[symbol] * 0.02)
+            opens = base_price * (1 + np.random.normal(0, 0.01, window))
+            bars = np.column_stack([
+                opens,
+                opens * (1 + np.abs(np.random.normal(0, 0.005, window))),
+                opens * (1 - np.abs(np.random.normal(0, 0.005, window))),
+                opens * (1 + np.random.normal(0, 0.005, window)),
+                np.random.uniform(1000000, 10000000, window)
+            ])
             
-            if future_price > current_price * 1.02:  # 2% threshold
-                y.append([1, 0, 0])  # BUY
-            elif future_price < current_price * 0.98:  # 2% threshold
-                y.append([0, 1, 0])  # SELL
-            else:
-                y.append([0, 0, 1])  # HOLD
+            self.bar_buffers[symbol] = OHLCVRingBuffer(window, TRAINING_CONFIG["features"])
+            self.bar_buffers[symbol].ingest(bars)
+            self._update_market_snapshot(symbol, datetime.now())
+    
+    def append_bar(self, symbol: str, bar: List[float], timestamp: Optional[datetime] = None) -> int:
+        """Ingest a new OHLCV bar for a symbol and return its sequence number"""
+        if symbol not in self.bar_buffers:
+            raise HTTPException(status_code=404, detail=f"Unknown symbol {symbol}")
         
-        X = np.array(X)
-        y = np.array(y)
+        try:
+            self.bar_buffers[symbol].append_bar(bar)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
-        # Normalize features
-        X_reshaped = X.reshape(-1, X.shape[-1])
-        X_scaled = self.scalers[symbol].fit_transform(X_reshaped)
-        X_scaled = X_scaled.reshape(X.shape)
+        sequence = self.bar_buffers[symbol].sequence
+        self.signal_cache.invalidate(symbol, before_sequence=sequence)
+        self._update_market_snapshot(symbol, timestamp or datetime.now())
         
-        # Train model
-        model.fit(X_scaled, y, epochs=10, batch_size=32, verbose=0)
-        logger.info(f"Neural network trained for {symbol}")
+        # Mark held positions to market
+        self.ledger.mark_to_market(symbol, timestamp)
+        return sequence
     
-    def _generate_sample_data(self):
-        """Generate sample market data"""
-        symbols = ["AAPL", "GOOGL", "MSFT", "TSLA", "BTC", "ETH"]
-        base_prices = {"AAPL": 150, "GOOGL": 2800, "MSFT": 300, "TSLA": 800, "BTC": 45000, "ETH": 3000}
+    def _update_market_snapshot(self, symbol: str, timestamp: datetime):
+        """Refresh the quote of a symbol from its latest bars"""
+        raw = self.bar_buffers[symbol].window(scaled=False)
+        previous_close, close, volume = raw[-2, 3], raw[-1, 3], raw[-1, 4]
         
-        for symbol in symbols:
-            self.market_data[symbol] = {
-                "price": base_prices[symbol] + np.random.normal(0, base_prices[symbol] * 0.02),
-                "volume": np.random.randint(1000000, 10000000),
-                "change": np.random.normal(0, 0.02),
-                "timestamp": datetime.now()
-            }
+        self.market_data[symbol] = {
+            "price": float(close),
+            "volume": int(volume),
+            "change": float(close / previous_close - 1) if previous_close else 0.0,
+            "timestamp": timestamp,
+            "sequence": self.bar_buffers[symbol].sequence
+        }
     
     def predict_signal(self, symbol: str) -> TradingSignal:
         """Generate trading signal using neural network"""
-        try:
+        result = self.predict_signal_batch([symbol])[0]
+        if isinstance(result, HTTPException):
+            raise result
+        return result
+    
+    def cached_signal(self, symbol: str) -> Optional[TradingSignal]:
+        """Signal for the symbol's latest bar if one was already computed"""
+        if symbol not in self.bar_buffers:
+            return None
+        return self.signal_cache.get(symbol, self.bar_buffers[symbol].sequence)
+    
+    def cached_signals(self, symbols: List[str]) -> Optional[List[TradingSignal]]:
+        """Signals for all symbols if every one is cached, otherwise None"""
+        signals = []
+        for symbol in symbols:
+            signal = self.cached_signal(symbol)
+            if signal is None:
+                return None
+            signals.append(signal)
+        return signals
+    
+    def predict_signals(self, symbols: List[str]) -> List[TradingSignal]:
+        """Generate trading signals for many symbols with one forward pass per model
+        
+        Symbols that fail are logged and left out, as with per-symbol calls.
+        """
+        results = self.predict_signal_batch(symbols)
+        return [result for result in results if isinstance(result, TradingSignal)]
+    
+    def predict_signal_batch(self, symbols: List[str]) -> List[Union[TradingSignal, HTTPException]]:
+        """Generate one result per requested symbol, in request order
+        
+        Requests are grouped by model; every request for a symbol shares its latest
+        bar window, so each model runs at most one forward pass per call. Each result
+        is either the signal or the HTTPException that predict_signal would have
+        raised for that symbol.
+        """
+        results: List[Union[TradingSignal, HTTPException, None]] = [None] * len(symbols)
+        
+        requests_by_symbol: Dict[str, List[int]] = {}
+        for position, symbol in enumerate(symbols):
             if symbol not in self.models:
-                raise ValueError(f"No model available for {symbol}")
-            
-            # Get recent market data (in production, fetch from real API)
-            recent_data = self._get_recent_data(symbol)
-            
-            # Prepare input for neural network
-            X = np.array([recent_data])
-            X_scaled = self.scalers[symbol].transform(X.reshape(-1, X.shape[-1]))
-            X_scaled = X_scaled.reshape(X.shape)
-            
-            # Get prediction
-            prediction = self.models[symbol].predict(X_scaled, verbose=0)[0]
-            
-            # Convert to trading signal
-            action_scores = {
-                "BUY": prediction[0],
-                "SELL": prediction[1],
-                "HOLD": prediction[2]
-            }
-            
-            best_action = max(action_scores, key=action_scores.get)
-            confidence = action_scores[best_action]
-            
-            current_price = self.market_data[symbol]["price"]
-            
-            return TradingSignal(
-                symbol=symbol,
-                action=best_action,
-                confidence=float(confidence),
-                price=current_price,
-                timestamp=datetime.now(),
-                neural_network_output={
-                    "buy_probability": float(prediction[0]),
-                    "sell_probability": float(prediction[1]),
-                    "hold_probability": float(prediction[2])
-                }
-            )
-            
-        except Exception as e:
-            logger.error(f"Prediction failed for {symbol}: {e}")
-            raise HTTPException(status_code=500, detail=str(e))
+                results[position] = self._prediction_error(symbol, ValueError(f"No model available for {symbol}"))
+                continue
+            requests_by_symbol.setdefault(symbol, []).append(position)
+        
+        for symbol, positions in requests_by_symbol.items():
+            try:
+                # Every request for a symbol sees the same latest window, so it is run once
+                sequence, window = self.bar_buffers[symbol].versioned_snapshot()
+                signal = self.signal_cache.get(symbol, sequence, count=False)
+                if signal is None:
+                    signal = self._build_signal(symbol, self._forward(symbol, window[np.newaxis])[0], sequence)
+                    self.signal_cache.put(symbol, sequence, signal)
+                
+                for position in positions:
+                    results[position] = signal
+            except Exception as e:
+                error = self._prediction_error(symbol, e)
+                for position in positions:
+                    results[position] = error
+        
+        return results
+    
+    def _prediction_error(self, symbol: str, error: Exception) -> HTTPException:
+        logger.error(f"Prediction failed for {symbol}: {error}")
+        return HTTPException(status_code=500, detail=str(error))
+    
+    def _forward(self, symbol: str, X_scaled: np.ndarray) -> np.ndarray:
+        """Run one forward pass of a symbol's model over a batch of windows"""
+        # Both engines expose predict_on_batch; for Keras it reuses the compiled
+        # predict function and skips the per-call data adapter and callback
+        # setup of model.predict, which dominates the cost of small batches
+        return np.asarray(self.models[symbol].predict_on_batch(X_scaled))
     
-    def _get_recent_data(self, symbol: str) -> List:
-        """Get recent market data for neural network input"""
-        # Generate sample recent data (in production, fetch from real API)
-        base_price = self.market_data[symbol]["price"]
-        recent_data = []
+    def _build_signal(self, symbol: str, prediction: np.ndarray, sequence: int) -> TradingSignal:
+        """Convert a model output into a trading signal"""
+        action_scores = {
+            "BUY": prediction[0],
+            "SELL": prediction[1],
+            "HOLD": prediction[2]
+        }
         
-        for i in range(60):  # 60 time steps
-            price = base_price * (1 + np.random.normal(0, 0.01))
-            high = price * (1 + abs(np.random.normal(0, 0.005)))
-            low = price * (1 - abs(np.random.normal(0, 0.005)))
-            close = price * (1 + np.random.normal(0, 0.005))
-            volume = np.random.uniform(1000000, 10000000)
-            
-            recent_data.append([price, high, low, close, volume])
+        best_action = max(action_scores, key=action_scores.get)
+        confidence = action_scores[best_action]
+        
+        current_price = self.market_data[symbol]["price"]
         
-        return recent_data
+        return TradingSignal(
+            symbol=symbol,
+            action=best_action,
+            confidence=float(confidence),
+            price=current_price,
+            timestamp=datetime.now(),
+            neural_network_output={
+                "buy_probability": float(prediction[0]),
+                "sell_probability": float(prediction[1]),
+                "hold_probability": float(prediction[2])
+            },
+            sequence=sequence
+        )
     
     def execute_trade(self, order: TradeOrder) -> Dict:
         """Execute a trade order"""
@@ -225,46 +328,14 @@ class NeuroTradeAI:
             current_price = self.market_data[symbol]["price"]
             execution_price = current_price if order.order_type == "MARKET" else order.price
             
-            total_cost = execution_price * order.quantity
-            
-            if order.action == "BUY":
-                if self.portfolio.cash < total_cost:
-                    raise HTTPException(status_code=400, detail="Insufficient cash")
-                
-                self.portfolio.cash -= total_cost
-                self.portfolio.positions[symbol] = self.portfolio.positions.get(symbol, 0) + order.quantity
-                
-            elif order.action == "SELL":
-                if self.portfolio.positions.get(symbol, 0) < order.quantity:
-                    raise HTTPException(status_code=400, detail="Insufficient shares")
-                
-                self.portfolio.cash += total_cost
-                self.portfolio.positions[symbol] -= order.quantity
-                
-                if self.portfolio.positions[symbol] == 0:
-                    del self.portfolio.positions[symbol]
-            
-            # Update portfolio value
-            self._update_portfolio_value()
-            
-            # Record trade
-            trade_record = {
-                "trade_id": f"TRADE_{len(self.trading_history) + 1:06d}",
-                "symbol": symbol,
-                "action": order.action,
-                "quantity": order.quantity,
-                "price": execution_price,
-                "total_value": total_cost,
-                "timestamp": datetime.now(),
-                "order_type": order.order_type
-            }
-            
-            self.trading_history.append(trade_record)
+            result = self.ledger.execute(
+                order.user_id, symbol, order.action, order.quantity, execution_price, order.order_type
+            )
             
             return {
                 "success": True,
-                "trade_record": trade_record,
-                "portfolio": self.portfolio
+                "trade_record": result["trade_record"],
+                "portfolio": result["portfolio"]
             }
             
         except HTTPException:
@@ -273,46 +344,35 @@ class NeuroTradeAI:
             logger.error(f"Trade execution failed: {e}")
             raise HTTPException(status_code=500, detail=str(e))
     
-    def _update_portfolio_value(self):
-        """Update portfolio total value"""
-        total_value = self.portfolio.cash
-        
-        for symbol, quantity in self.portfolio.positions.items():
-            if symbol in self.market_data:
-                total_value += self.market_data[symbol]["price"] * quantity
-        
-        self.portfolio.total_value = total_value
-        self.portfolio.pnl = total_value - 100000.0  # Initial value was 100k
+    def _current_price(self, symbol: str) -> Optional[float]:
+        quote = self.market_data.get(symbol)
+        return quote["price"] if quote else None
     
-    def get_portfolio_performance(self) -> Dict:
+    def get_portfolio_performance(self, user_id: str = DEMO_USER, lookback: str = "30d") -> Dict:
         """Get portfolio performance metrics"""
-        self._update_portfolio_value()
+        portfolio = self.ledger.portfolio(user_id)
         
         # Calculate metrics
-        total_return = (self.portfolio.total_value - 100000.0) / 100000.0 * 100
+        total_return = (portfolio.total_value - self.ledger.initial_cash) / self.ledger.initial_cash * 100
         
-        # Calculate daily returns for volatility
-        if len(self.trading_history) > 1:
-            returns = []
-            for i in range(1, min(len(self.trading_history), 30)):
-                # Simulate daily returns
-                returns.append(np.random.normal(0.001, 0.02))  # 0.1% daily return, 2% volatility
-            
-            volatility = np.std(returns) * np.sqrt(252) * 100  # Annualized volatility
-            sharpe_ratio = (np.mean(returns) * 252) / (np.std(returns) * np.sqrt(252)) if np.std(returns) > 0 else 0
-        else:
-            volatility = 0
-            sharpe_ratio = 0
+        try:
+            metrics = self.ledger.performance(user_id, lookback)
+        except ValueError as e:
+            raise HTTPException(status_code=400, detail=str(e))
         
         return {
-            "total_value": self.portfolio.total_value,
-            "cash": self.portfolio.cash,
+            "user_id": user_id,
+            "total_value": portfolio.total_value,
+            "cash": portfolio.cash,
             "total_return": total_return,
-            "pnl": self.portfolio.pnl,
-            "volatility": volatility,
-            "sharpe_ratio": sharpe_ratio,
-            "positions": self.portfolio.positions,
-            "total_trades": len(self.trading_history)
+            "pnl": portfolio.pnl,
+            "volatility": metrics["volatility"],
+            "sharpe_ratio": metrics["sharpe_ratio"],
+            "max_drawdown": metrics["max_drawdown"],
+            "turnover": metrics["turnover"],
+            "lookback": lookback,
+            "positions": portfolio.positions,
+            "total_trades": self.ledger.trade_count(user_id)
         }
 
 # Initialize FastAPI app
@@ -328,6 +388,19 @@ app.add_middleware(
 # Initialize AI system
 neuro_trade = NeuroTradeAI()
 
+# Predictions block, so they run on a bounded pool instead of the event loop
+inference = InferenceExecutor()
+
+# Concurrent single-symbol requests are coalesced into batched forward passes
+signal_batcher = MicroBatcher(neuro_trade.predict_signal_batch, inference)
+
+# Streamed signals are computed once per data change and shared by all subscribers
+signal_broadcaster = SignalBroadcaster(neuro_trade.predict_signals, inference)
+
+@app.on_event("shutdown")
+async def shutdown_inference():
+    inference.shutdown()
+
 @app.get("/")
 async def root():
     return {
@@ -337,25 +410,51 @@ async def root():
         "neural_models": len(neuro_trade.models)
     }
 
+@app.get("/api/models")
+async def get_model_status():
+    """Get how each neural model was loaded and how long it took"""
+    return {"success": True, "models": neuro_trade.model_timings, "training_job": neuro_trade.training_job}
+
+@app.get("/api/inference")
+async def get_inference_status():
+    """Get load of the inference executor, micro-batching and cache metrics"""
+    return {"success": True, "executor": inference.stats(), "batcher": signal_batcher.stats(), "cache": neuro_trade.signal_cache.stats(), "stream": signal_broadcaster.stats()}
+
 @app.get("/api/signals/{symbol}")
 async def get_trading_signal(symbol: str):
     """Get AI trading signal for a symbol"""
-    signal = neuro_trade.predict_signal(symbol.upper())
+    symbol = symbol.upper()
+    signal = neuro_trade.cached_signal(symbol) or await signal_batcher.submit(symbol)
     return {"success": True, "signal": signal}
 
 @app.get("/api/signals")
 async def get_all_signals():
     """Get trading signals for all symbols"""
-    signals = []
-    for symbol in neuro_trade.models.keys():
-        try:
-            signal = neuro_trade.predict_signal(symbol)
-            signals.append(signal)
-        except Exception as e:
-            logger.error(f"Failed to get signal for {symbol}: {e}")
-    
+    symbols = list(neuro_trade.models.keys())
+    signals = neuro_trade.cached_signals(symbols)
+    if signals is None:
+        signals = await inference.run(neuro_trade.predict_signals, symbols)
     return {"success": True, "signals": signals}
 
+@app.get("/api/stream/signals")
+async def stream_signals(symbols: Optional[str] = None):
+    """Stream trading signals over Server-Sent Events whenever a symbol's data changes"""
+    requested = {s.strip().upper() for s in symbols.split(",") if s.strip()} if symbols else None
+    initial_symbols = sorted(requested) if requested else list(neuro_trade.models.keys())
+    
+    # Start every subscriber from the current signals, then push changes
+    async def initial():
+        signals = neuro_trade.cached_signals(initial_symbols)
+        if signals is None:
+            signals = await inference.run(neuro_trade.predict_signals, initial_symbols)
+        return signals
+    
+    return StreamingResponse(
+        signal_broadcaster.stream(requested, initial),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
+
 @app.post("/api/trade")
 async def execute_trade(order: TradeOrder):
     """Execute a trade order"""
@@ -363,9 +462,9 @@ async def execute_trade(order: TradeOrder):
     return result
 
 @app.get("/api/portfolio")
-async def get_portfolio():
-    """Get portfolio information"""
-    performance = neuro_trade.get_portfolio_performance()
+async def get_portfolio(user_id: str = DEMO_USER, lookback: str = "30d"):
+    """Get portfolio information over a lookback window (1d, 30d, 1y or all)"""
+    performance = neuro_trade.get_portfolio_performance(user_id, lookback)
     return {"success": True, "portfolio": performance}
 
 @app.get("/api/market-data")
@@ -373,23 +472,27 @@ async def get_market_data():
     """Get current market data"""
     return {"success": True, "market_data": neuro_trade.market_data}
 
+@app.post("/api/market-data/{symbol}/bars")
+async def ingest_bar(symbol: str, bar: MarketBar):
+    """Ingest a new OHLCV bar for a symbol"""
+    symbol = symbol.upper()
+    sequence = neuro_trade.append_bar(symbol, [bar.open, bar.high, bar.low, bar.close, bar.volume], bar.timestamp)
+    signal_broadcaster.notify(symbol)
+    return {"success": True, "symbol": symbol, "sequence": sequence, "market_data": neuro_trade.market_data[symbol]}
+
 @app.get("/api/trading-history")
-async def get_trading_history():
-    """Get trading history"""
-    recent_trades = neuro_trade.trading_history[-20:]  # Last 20 trades
+async def get_trading_history(user_id: Optional[str] = None):
+    """Get trading history, across all users or for one"""
+    recent_trades = neuro_trade.ledger.recent_trades(user_id, limit=20)  # Last 20 trades
     return {"success": True, "trades": recent_trades}
 
 @app.post("/api/predict-batch")
 async def predict_batch(symbols: List[str]):
     """Get predictions for multiple symbols"""
-    predictions = []
-    for symbol in symbols:
-        try:
-            signal = neuro_trade.predict_signal(symbol.upper())
-            predictions.append(signal)
-        except Exception as e:
-            logger.error(f"Batch prediction failed for {symbol}: {e}")
-    
+    symbols = [symbol.upper() for symbol in symbols]
+    predictions = neuro_trade.cached_signals(symbols)
+    if predictions is None:
+        predictions = await inference.run(neuro_trade.predict_signals, symbols)
     return {"success": True, "predictions": predictions}
 
 if __name__ == "__main__":
@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Market Data Buffers
+Fixed-size OHLCV history per symbol, kept ready for neural network input
+"""
+
+import threading
+from typing import Sequence, Tuple
+
+import numpy as np
+
+
+class OHLCVRingBuffer:
+    """Preallocated ring buffer of the latest `capacity` OHLCV bars
+
+    Every bar is written twice, at slot i and i + capacity, so the latest
+    `capacity` bars are always one contiguous slice of the backing array and
+    the model window is a view rather than a reassembled copy. Bars are
+    scaled once on ingest, so building a window does no arithmetic.
+    """
+
+    def __init__(self, capacity: int = 60, features: int = 5, scaler=None):
+        self.capacity = capacity
+        self.features = features
+        self._raw = np.zeros((2 * capacity, features))
+        self._scaled = np.zeros((2 * capacity, features), dtype=np.float32)
+        self._scale = np.ones(features)
+        self._offset = np.zeros(features)
+        self._lock = threading.Lock()
+        self.sequence = 0  # total bars ever ingested
+        if scaler is not None:
+            self.set_scaler(scaler)
+
+    def set_scaler(self, scaler):
+        """Adopt a fitted MinMaxScaler and rescale the stored bars"""
+        with self._lock:
+            self._scale = np.asarray(scaler.scale_, dtype=float)
+            self._offset = np.asarray(scaler.min_, dtype=float)
+            self._scaled[:] = self._raw * self._scale + self._offset
+
+    def append_bar(self, bar: Sequence[float]):
+        """Ingest one [open, high, low, close, volume] bar"""
+        row = np.asarray(bar, dtype=float)
+        if row.shape != (self.features,):
+            raise ValueError(f"Expected {self.features} values per bar, got {row.shape}")
+        with self._lock:
+            self._append(row)
+
+    def _append(self, row: np.ndarray):
+        # Scale under the lock too, so a concurrent set_scaler cannot leave this bar on the old scale
+        slot = self.sequence % self.capacity
+        self._raw[slot] = self._raw[slot + self.capacity] = row
+        self._scaled[slot] = self._scaled[slot + self.capacity] = row * self._scale + self._offset
+        self.sequence += 1
+
+    def ingest(self, bars: np.ndarray):
+        """Ingest an (n, features) array of bars, oldest first"""
+        bars = np.asarray(bars, dtype=float)
+        if bars.ndim != 2 or bars.shape[1] != self.features:
+            raise ValueError(f"Expected bars of {self.features} values, got {bars.shape}")
+
+        # Bars older than the window never need to be written
+        skipped = max(len(bars) - self.capacity, 0)
+        with self._lock:
+            self.sequence += skipped
+            for bar in bars[skipped:]:
+                self._append(bar)
+
+    def window(self, scaled: bool = True) -> np.ndarray:
+        """Read-only (capacity, features) view of the latest bars, oldest first"""
+        start = self.sequence % self.capacity
+        view = (self._scaled if scaled else self._raw)[start:start + self.capacity]
+        view.flags.writeable = False
+        return view
+
+    def versioned_snapshot(self, scaled: bool = True) -> Tuple[int, np.ndarray]:
+        """Copy the latest window together with the sequence number it reflects"""
+        with self._lock:
+            return self.sequence, self.window(scaled).copy()
@@ -0,0 +1,116 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Model Store
+Persists trained neural network models and their scalers on disk
+"""
+
+import hashlib
+import json
+import logging
+import os
+import shutil
+import tempfile
+from datetime import datetime
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+import joblib
+
+from numpy_lstm import NumpyLSTMModel, export_weights, save_weights
+
+logger = logging.getLogger(__name__)
+
+MODEL_FILE = "model.keras"
+WEIGHTS_FILE = "weights.npz"
+SCALER_FILE = "scaler.joblib"
+METADATA_FILE = "metadata.json"
+
+
+def config_hash(config: Dict) -> str:
+    """Stable short hash of a training configuration"""
+    payload = json.dumps(config, sort_keys=True, default=str)
+    return hashlib.sha256(payload.encode("utf-8")).hexdigest()[:16]
+
+
+class ModelStore:
+    """On-disk store of trained models keyed by symbol and training-config hash"""
+
+    def __init__(self, root: Optional[str] = None):
+        default_root = Path(__file__).resolve().parent / "model_store"
+        self.root = Path(root or os.environ.get("NEUROTRADE_MODEL_DIR", default_root))
+
+    def _entry_dir(self, symbol: str, digest: str) -> Path:
+        return self.root / symbol / digest
+
+    def has(self, symbol: str, digest: str) -> bool:
+        """Check whether a complete entry exists for a symbol and config"""
+        entry = self._entry_dir(symbol, digest)
+        return all((entry / name).exists() for name in (MODEL_FILE, SCALER_FILE, METADATA_FILE))
+
+    def metadata(self, symbol: str, digest: str) -> Optional[Dict]:
+        """Read the metadata of a stored entry"""
+        path = self._entry_dir(symbol, digest) / METADATA_FILE
+        if not path.exists():
+            return None
+        with open(path) as f:
+            return json.load(f)
+
+    def save(self, symbol: str, digest: str, model, scaler, metadata: Optional[Dict] = None) -> Path:
+        """Save a model and its scaler, replacing any existing entry atomically"""
+        entry = self._entry_dir(symbol, digest)
+        entry.parent.mkdir(parents=True, exist_ok=True)
+
+        # Write into a scratch directory first so readers never see a partial entry
+        staging = Path(tempfile.mkdtemp(prefix=f".{digest}-", dir=entry.parent))
+        try:
+            model.save(staging / MODEL_FILE)
+            save_weights(staging / WEIGHTS_FILE, export_weights(model))
+            joblib.dump(scaler, staging / SCALER_FILE)
+            with open(staging / METADATA_FILE, "w") as f:
+                json.dump({
+                    "symbol": symbol,
+                    "config_hash": digest,
+                    "saved_at": datetime.now().isoformat(),
+                    **(metadata or {})
+                }, f, indent=2, default=str)
+
+            if entry.exists():
+                shutil.rmtree(entry)
+            os.replace(staging, entry)
+        except Exception:
+            shutil.rmtree(staging, ignore_errors=True)
+            raise
+
+        self._prune_stale(symbol, digest)
+        return entry
+
+    def load(self, symbol: str, digest: str, engine: str = "keras") -> Tuple[object, object]:
+        """Load a model and its scaler
+
+        With engine="numpy" the model is a NumpyLSTMModel read from the exported
+        weights and TensorFlow is not imported. Entries saved before weights
+        were exported are converted once, which does need TensorFlow.
+        """
+        entry = self._entry_dir(symbol, digest)
+        scaler = joblib.load(entry / SCALER_FILE)
+
+        if engine == "numpy":
+            if not (entry / WEIGHTS_FILE).exists():
+                save_weights(entry / WEIGHTS_FILE, export_weights(self._load_keras(entry)))
+                logger.info(f"Exported NumPy weights for {symbol}/{digest}")
+            return NumpyLSTMModel.load(entry / WEIGHTS_FILE), scaler
+
+        return self._load_keras(entry), scaler
+
+    def _load_keras(self, entry: Path):
+        import tensorflow as tf
+
+        return tf.keras.models.load_model(entry / MODEL_FILE)
+
+    def _prune_stale(self, symbol: str, digest: str):
+        """Remove entries of a symbol that were trained with another config"""
+        symbol_dir = self.root / symbol
+        for path in symbol_dir.iterdir():
+            if path.is_dir() and path.name != digest and not path.name.startswith("."):
+                shutil.rmtree(path, ignore_errors=True)
+                logger.info(f"Removed stale model entry {symbol}/{path.name}")
@@ -0,0 +1,134 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - NumPy Inference Engine
+Runs the trained LSTM networks with NumPy only, so serving never imports TensorFlow
+"""
+
+import json
+from pathlib import Path
+from typing import Dict, List
+
+import numpy as np
+
+
+def _softmax(x: np.ndarray) -> np.ndarray:
+    shifted = np.exp(x - x.max(axis=-1, keepdims=True))
+    return shifted / shifted.sum(axis=-1, keepdims=True)
+
+
+ACTIVATIONS = {
+    "linear": lambda x: x,
+    "tanh": np.tanh,
+    "sigmoid": lambda x: 1.0 / (1.0 + np.exp(-x)),
+    "relu": lambda x: np.maximum(x, 0),
+    "softmax": _softmax,
+}
+
+
+def export_weights(model) -> Dict[str, np.ndarray]:
+    """Pull the layer layout and weights out of a tf.keras.Sequential model
+
+    Supports LSTM, Dropout and Dense layers. Dropout is the identity at
+    inference time and is not exported.
+    """
+    layers: List[Dict] = []
+    arrays: Dict[str, np.ndarray] = {}
+
+    for index, layer in enumerate(model.layers):
+        kind = type(layer).__name__
+        config = layer.get_config()
+
+        if kind == "Dropout":
+            continue
+        if kind == "LSTM":
+            kernel, recurrent_kernel, bias = layer.get_weights()
+            layers.append({
+                "type": "lstm",
+                "units": config["units"],
+                "activation": config["activation"],
+                "recurrent_activation": config["recurrent_activation"],
+                "return_sequences": config["return_sequences"]
+            })
+            arrays[f"{index}_kernel"] = kernel
+            arrays[f"{index}_recurrent_kernel"] = recurrent_kernel
+            arrays[f"{index}_bias"] = bias
+        elif kind == "Dense":
+            kernel, bias = layer.get_weights()
+            layers.append({"type": "dense", "activation": config["activation"]})
+            arrays[f"{index}_kernel"] = kernel
+            arrays[f"{index}_bias"] = bias
+        else:
+            raise ValueError(f"Unsupported layer for NumPy inference: {kind}")
+
+        layers[-1]["index"] = index
+
+    arrays["layers"] = np.array(json.dumps(layers))
+    return arrays
+
+
+def save_weights(path: Path, exported: Dict[str, np.ndarray]):
+    with open(path, "wb") as f:
+        np.savez(f, **exported)
+
+
+class NumpyLSTMModel:
+    """Inference-only LSTM/Dense stack exported from Keras
+
+    Exposes predict_on_batch so it can stand in for the Keras model.
+    Gate order follows Keras: input, forget, cell, output.
+    """
+
+    def __init__(self, exported: Dict[str, np.ndarray], dtype=np.float32):
+        self.dtype = dtype
+        self.layers = json.loads(str(exported["layers"]))
+        self.weights = {
+            name: np.ascontiguousarray(value, dtype=dtype)
+            for name, value in exported.items() if name != "layers"
+        }
+
+    @classmethod
+    def load(cls, path: Path) -> "NumpyLSTMModel":
+        with np.load(path) as data:
+            return cls({name: data[name] for name in data.files})
+
+    def predict_on_batch(self, X: np.ndarray) -> np.ndarray:
+        """Forward pass over a (batch, timesteps, features) array"""
+        outputs = np.asarray(X, dtype=self.dtype)
+        for layer in self.layers:
+            if layer["type"] == "lstm":
+                outputs = self._lstm(outputs, layer)
+            else:
+                weights = self.weights
+                index = layer["index"]
+                outputs = ACTIVATIONS[layer["activation"]](outputs @ weights[f"{index}_kernel"] + weights[f"{index}_bias"])
+        return outputs
+
+    def _lstm(self, X: np.ndarray, layer: Dict) -> np.ndarray:
+        index = layer["index"]
+        kernel = self.weights[f"{index}_kernel"]
+        recurrent_kernel = self.weights[f"{index}_recurrent_kernel"]
+        bias = self.weights[f"{index}_bias"]
+        activation = ACTIVATIONS[layer["activation"]]
+        recurrent_activation = ACTIVATIONS[layer["recurrent_activation"]]
+        units = layer["units"]
+
+        batch, timesteps, _ = X.shape
+        # Input projections for every timestep in one matmul; only h @ U is sequential
+        projected = X @ kernel + bias
+
+        h = np.zeros((batch, units), dtype=self.dtype)
+        c = np.zeros((batch, units), dtype=self.dtype)
+        sequence = np.empty((batch, timesteps, units), dtype=self.dtype) if layer["return_sequences"] else None
+
+        for t in range(timesteps):
+            z = projected[:, t] + h @ recurrent_kernel
+            i = recurrent_activation(z[:, :units])
+            f = recurrent_activation(z[:, units:2 * units])
+            g = activation(z[:, 2 * units:3 * units])
+            o = recurrent_activation(z[:, 3 * units:])
+            c = f * c + i * g
+            h = o * activation(c)
+            if sequence is not None:
+                sequence[:, t] = h
+
+        return sequence if sequence is not None else h
@@ -0,0 +1,82 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Signal Cache
+Serves repeated signal requests without rerunning the neural network
+"""
+
+import os
+import threading
+from collections import OrderedDict
+from typing import Dict, Optional, Set, Tuple
+
+
+class SignalCache:
+    """LRU cache of trading signals keyed by (symbol, bar sequence number)
+
+    A signal only depends on the model and the latest bar window, so it stays
+    valid until the symbol's next bar arrives. Entries for a symbol are dropped
+    as soon as a newer bar is ingested.
+    """
+
+    def __init__(self, max_entries: Optional[int] = None):
+        self.max_entries = max_entries or int(os.environ.get("NEUROTRADE_SIGNAL_CACHE_SIZE", 1024))
+        self._entries: "OrderedDict[Tuple[str, int], object]" = OrderedDict()
+        self._sequences: Dict[str, Set[int]] = {}
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    def get(self, symbol: str, sequence: int, count: bool = True):
+        """Cached signal for a symbol at a bar sequence, or None
+
+        Pass count=False for re-checks of a lookup that was already counted.
+        """
+        key = (symbol, sequence)
+        with self._lock:
+            signal = self._entries.get(key)
+            if signal is None:
+                self.misses += count
+                return None
+            self._entries.move_to_end(key)
+            self.hits += count
+            return signal
+
+    def put(self, symbol: str, sequence: int, signal):
+        with self._lock:
+            self._entries[(symbol, sequence)] = signal
+            self._entries.move_to_end((symbol, sequence))
+            self._sequences.setdefault(symbol, set()).add(sequence)
+
+            while len(self._entries) > self.max_entries:
+                (evicted_symbol, evicted_sequence), _ = self._entries.popitem(last=False)
+                self._forget(evicted_symbol, evicted_sequence)
+                self.evictions += 1
+
+    def invalidate(self, symbol: str, before_sequence: Optional[int] = None):
+        """Drop a symbol's entries, or only those older than `before_sequence`"""
+        with self._lock:
+            stale = [
+                sequence for sequence in self._sequences.get(symbol, ())
+                if before_sequence is None or sequence < before_sequence
+            ]
+            for sequence in stale:
+                del self._entries[(symbol, sequence)]
+                self._forget(symbol, sequence)
+
+    def _forget(self, symbol: str, sequence: int):
+        sequences = self._sequences[symbol]
+        sequences.discard(sequence)
+        if not sequences:
+            del self._sequences[symbol]
+
+    def stats(self) -> Dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "max_entries": self.max_entries,
+            "hits": self.hits,
+            "misses": self.misses,
+            "evictions": self.evictions,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0
+        }
@@ -0,0 +1,114 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Signal Streaming
+Pushes trading signals to subscribers over Server-Sent Events
+"""
+
+import asyncio
+import json
+import logging
+import os
+from typing import AsyncIterator, Awaitable, Callable, Dict, List, Optional, Set
+
+from fastapi.encoders import jsonable_encoder
+
+from inference import InferenceExecutor
+
+logger = logging.getLogger(__name__)
+
+
+def sse_event(event: str, data) -> str:
+    """Format one Server-Sent Event"""
+    return f"event: {event}\ndata: {json.dumps(jsonable_encoder(data))}\n\n"
+
+
+class SignalBroadcaster:
+    """Computes each changed symbol's signal once and fans it out to every subscriber
+
+    `notify` marks a symbol as changed. One publisher task computes signals for
+    all changed symbols in a single batch on the inference executor and puts the
+    result on each interested subscriber's queue. A subscriber that falls behind
+    loses its oldest queued signals instead of slowing everyone else down.
+    """
+
+    def __init__(self, compute_fn: Callable[[List[str]], List], executor: InferenceExecutor, max_queue: Optional[int] = None):
+        self.compute_fn = compute_fn
+        self.executor = executor
+        self.max_queue = max_queue or int(os.environ.get("NEUROTRADE_STREAM_QUEUE_SIZE", 64))
+        self.heartbeat_seconds = float(os.environ.get("NEUROTRADE_STREAM_HEARTBEAT_SECONDS", 15))
+        self._subscribers: Dict[asyncio.Queue, Optional[Set[str]]] = {}
+        self._changed: Set[str] = set()
+        self._publisher: Optional[asyncio.Task] = None
+        self.published = 0
+        self.dropped = 0
+
+    @property
+    def subscriber_count(self) -> int:
+        return len(self._subscribers)
+
+    def notify(self, symbol: str):
+        """Mark a symbol's input data as changed; must be called on the event loop"""
+        if not self._subscribers:
+            return
+        self._changed.add(symbol)
+        if self._publisher is None or self._publisher.done():
+            self._publisher = asyncio.get_running_loop().create_task(self._publish())
+
+    async def _publish(self):
+        # Bars that arrive while a batch is computing are picked up by the next loop
+        while self._changed:
+            symbols = sorted(self._changed)
+            self._changed.clear()
+            try:
+                signals = await self.executor.run(self.compute_fn, symbols)
+            except Exception as e:
+                logger.warning(f"Signal broadcast failed for {symbols}: {e}")
+                continue
+            for signal in signals:
+                self._deliver(signal)
+
+    def _deliver(self, signal):
+        self.published += 1
+        for queue, symbols in self._subscribers.items():
+            if symbols is not None and signal.symbol not in symbols:
+                continue
+            if queue.full():
+                queue.get_nowait()
+                self.dropped += 1
+            queue.put_nowait(signal)
+
+    async def stream(self, symbols: Optional[Set[str]], initial: Callable[[], Awaitable[List]]) -> AsyncIterator[str]:
+        """SSE stream of signals for the given symbols (all symbols if None)
+
+        `initial` returns the current signals to start from. It is awaited only
+        after the subscriber is registered, so a signal published while it runs
+        is queued rather than lost. Each symbol's signals go out in bar sequence
+        order: a signal for a bar no newer than the last one sent is skipped,
+        which also drops the queued copy of a signal the snapshot already sent.
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=self.max_queue)
+        self._subscribers[queue] = symbols
+        try:
+            sent = {}
+            for signal in await initial():
+                sent[signal.symbol] = signal.sequence
+                yield sse_event("signal", signal)
+            while True:
+                try:
+                    signal = await asyncio.wait_for(queue.get(), self.heartbeat_seconds)
+                except asyncio.TimeoutError:
+                    yield ": keep-alive\n\n"
+                    continue
+                if signal.sequence <= sent.get(signal.symbol, -1):
+                    continue
+                sent[signal.symbol] = signal.sequence
+                yield sse_event("signal", signal)
+        finally:
+            self._subscribers.pop(queue, None)
+
+    def stats(self) -> Dict:
+        return {
+            "subscribers": self.subscriber_count,
+            "published": self.published,
+            "dropped": self.dropped
+        }
@@ -0,0 +1,132 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Model Training
+Trains each symbol's model in its own process and writes it to the model store
+
+Usage: python train.py [--symbols AAPL BTC ...] [--workers N] [--force]
+"""
+
+import argparse
+import logging
+import multiprocessing
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from contextlib import contextmanager
+from typing import Dict, List, Optional
+
+from model_store import ModelStore, config_hash
+from training import SYMBOLS, TRAINING_CONFIG
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger(__name__)
+
+THREAD_ENV_VARS = ("OMP_NUM_THREADS", "MKL_NUM_THREADS", "OPENBLAS_NUM_THREADS", "TF_NUM_INTRAOP_THREADS")
+
+
+@contextmanager
+def _worker_environment(threads: int):
+    """Environment inherited by spawned workers, so thread caps apply before any import
+
+    With one process per symbol, letting every BLAS and TensorFlow runtime use
+    all cores would oversubscribe the machine, so each worker gets its share.
+    """
+    overrides = {name: str(threads) for name in THREAD_ENV_VARS}
+    overrides["TF_NUM_INTEROP_THREADS"] = "1"
+    overrides["TF_CPP_MIN_LOG_LEVEL"] = os.environ.get("TF_CPP_MIN_LOG_LEVEL", "2")
+
+    saved = {name: os.environ.get(name) for name in overrides}
+    os.environ.update(overrides)
+    try:
+        yield
+    finally:
+        for name, value in saved.items():
+            if value is None:
+                os.environ.pop(name, None)
+            else:
+                os.environ[name] = value
+
+
+def _init_worker(threads: int):
+    """Apply the thread caps to TensorFlow's runtime in a worker process"""
+    import tensorflow as tf
+
+    tf.config.threading.set_intra_op_parallelism_threads(threads)
+    tf.config.threading.set_inter_op_parallelism_threads(1)
+
+
+def _train_symbol(symbol: str, config: Dict, store_root: str) -> Dict:
+    """Train one symbol's model and save it; runs inside a worker process"""
+    from sklearn.preprocessing import MinMaxScaler
+
+    from training import build_model, train_model
+
+    started = time.perf_counter()
+    scaler = MinMaxScaler()
+    model = train_model(build_model(config), symbol, config, scaler)
+    train_seconds = time.perf_counter() - started
+
+    ModelStore(store_root).save(symbol, config_hash(config), model, scaler, {
+        "training_config": config,
+        "train_seconds": train_seconds
+    })
+    return {"symbol": symbol, "seconds": round(train_seconds, 3)}
+
+
+def stale_symbols(store: ModelStore, symbols: List[str], config: Dict) -> List[str]:
+    """Symbols whose stored model is missing or was trained with another config"""
+    digest = config_hash(config)
+    return [symbol for symbol in symbols if not store.has(symbol, digest)]
+
+
+def train_models(
+    symbols: Optional[List[str]] = None,
+    config: Dict = TRAINING_CONFIG,
+    store_root: Optional[str] = None,
+    workers: Optional[int] = None,
+    force: bool = False
+) -> Dict[str, Dict]:
+    """Train the given symbols in parallel, one process each, and store the results"""
+    store = ModelStore(store_root)
+    symbols = symbols or SYMBOLS
+    pending = symbols if force else stale_symbols(store, symbols, config)
+    if not pending:
+        logger.info("All models are up to date")
+        return {}
+
+    cores = os.cpu_count() or 1
+    workers = max(1, min(workers or cores, len(pending)))
+    threads = max(1, cores // workers)
+    logger.info(f"Training {len(pending)} models on {workers} workers with {threads} threads each")
+
+    results = {}
+    # Spawn rather than fork: TensorFlow runtimes are not fork-safe
+    context = multiprocessing.get_context("spawn")
+    with _worker_environment(threads), ProcessPoolExecutor(
+        workers, mp_context=context, initializer=_init_worker, initargs=(threads,)
+    ) as pool:
+        futures = {pool.submit(_train_symbol, symbol, config, str(store.root)): symbol for symbol in pending}
+        for future in as_completed(futures):
+            symbol = futures[future]
+            try:
+                results[symbol] = future.result()
+                logger.info(f"Trained neural network for {symbol} in {results[symbol]['seconds']:.2f}s")
+            except Exception as e:
+                results[symbol] = {"symbol": symbol, "error": str(e)}
+                logger.error(f"Training failed for {symbol}: {e}")
+    return results
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Train NeuroTrade AI models into the model store")
+    parser.add_argument("--symbols", nargs="+", choices=SYMBOLS, help="symbols to train (default: all)")
+    parser.add_argument("--workers", type=int, help="worker processes (default: one per core)")
+    parser.add_argument("--store", help="model store directory (default: NEUROTRADE_MODEL_DIR)")
+    parser.add_argument("--force", action="store_true", help="retrain even if the stored model is current")
+    args = parser.parse_args()
+
+    started = time.perf_counter()
+    results = train_models(args.symbols, store_root=args.store, workers=args.workers, force=args.force)
+    failed = [symbol for symbol, result in results.items() if "error" in result]
+    logger.info(f"Training finished in {time.perf_counter() - started:.2f}s")
+    raise SystemExit(1 if failed else 0)
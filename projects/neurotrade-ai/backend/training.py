@@ -0,0 +1,139 @@
+#!/usr/bin/env python3
+"""
+NeuroTrade AI - Training Data
+Vectorized generation of sample OHLCV histories and LSTM training sequences
+"""
+
+from typing import Optional, Tuple
+
+import numpy as np
+from numpy.lib.stride_tricks import sliding_window_view
+
+SYMBOLS = ["AAPL", "GOOGL", "MSFT", "TSLA", "BTC", "ETH"]
+
+# Everything that influences a trained model; changing any value invalidates stored models
+TRAINING_CONFIG = {
+    "sequence_length": 60,
+    "features": 5,
+    "lstm_units": 50,
+    "lstm_layers": 3,
+    "dropout": 0.2,
+    "dense_units": 25,
+    "outputs": 3,
+    "samples": 1000,
+    "horizon": 3,
+    "threshold": 0.02,
+    "epochs": 10,
+    "batch_size": 32,
+    "seed": 42,
+    "sequence_builder": "sliding_window"
+}
+
+# Target encoding (BUY=0, SELL=1, HOLD=2)
+BUY, SELL, HOLD = 0, 1, 2
+
+
+def base_price_for(symbol: str) -> float:
+    """Starting price of the sample history for a symbol"""
+    return 100 if symbol in ["AAPL", "GOOGL", "MSFT", "TSLA"] else 1000
+
+
+def generate_sample_prices(base_price: float, samples: int, rng: np.random.Generator) -> np.ndarray:
+    """Random-walk price path with 2% daily volatility"""
+    changes = rng.normal(0, 0.02, samples)
+    return base_price * np.cumprod(1 + changes)
+
+
+def generate_sample_bars(prices: np.ndarray, rng: np.random.Generator) -> np.ndarray:
+    """Build an (len(prices) - 1, 5) OHLCV array from a price path in one pass"""
+    opens = prices[:-1]
+    count = len(opens)
+
+    bars = np.empty((count, 5))
+    bars[:, 0] = opens
+    bars[:, 1] = opens * (1 + np.abs(rng.normal(0, 0.01, count)))
+    bars[:, 2] = opens * (1 - np.abs(rng.normal(0, 0.01, count)))
+    bars[:, 3] = prices[1:]
+    bars[:, 4] = rng.uniform(1000000, 10000000, count)
+    return bars
+
+
+def build_training_sequences(
+    prices: np.ndarray,
+    bars: np.ndarray,
+    sequence_length: int,
+    horizon: int,
+    threshold: float
+) -> Tuple[np.ndarray, np.ndarray]:
+    """Slice bars into (N, sequence_length, 5) windows with one-hot BUY/SELL/HOLD targets
+
+    Window k covers bars[k:k + sequence_length] and is labelled by comparing the
+    price `horizon` steps after its end with the price at its end. The windows are
+    a read-only strided view over `bars`; no per-window copies are made.
+    """
+    count = len(prices) - horizon - sequence_length
+    if count <= 0:
+        raise ValueError("Not enough prices for a single training sequence")
+
+    X = sliding_window_view(bars, (sequence_length, bars.shape[1]))[:count, 0]
+
+    current = prices[sequence_length:sequence_length + count]
+    future = prices[sequence_length + horizon:sequence_length + horizon + count]
+
+    labels = np.full(count, HOLD)
+    labels[future > current * (1 + threshold)] = BUY
+    labels[future < current * (1 - threshold)] = SELL
+    y = np.eye(3, dtype=np.int64)[labels]
+
+    return X, y
+
+
+def build_model(config: dict):
+    """Create LSTM model for price prediction"""
+    import tensorflow as tf
+
+    units = config["lstm_units"]
+    dropout = config["dropout"]
+
+    model = tf.keras.Sequential([
+        tf.keras.layers.LSTM(units, return_sequences=True, input_shape=(config["sequence_length"], config["features"])),
+        tf.keras.layers.Dropout(dropout),
+        tf.keras.layers.LSTM(units, return_sequences=True),
+        tf.keras.layers.Dropout(dropout),
+        tf.keras.layers.LSTM(units),
+        tf.keras.layers.Dropout(dropout),
+        tf.keras.layers.Dense(config["dense_units"]),
+        tf.keras.layers.Dense(config["outputs"])  # BUY, SELL, HOLD probabilities
+    ])
+
+    model.compile(optimizer='adam', loss='mse', metrics=['accuracy'])
+    return model
+
+
+def sample_training_set(symbol: str, config: dict, scaler, rng: Optional[np.random.Generator] = None):
+    """Generate the scaled sample training set for a symbol
+
+    The scaler is fitted on the bars covered by the windows, which has the same
+    min/max as fitting on every flattened window, and is applied once per bar
+    before windowing instead of once per window step.
+    """
+    rng = rng or np.random.default_rng(config["seed"])
+    sequence_length = config["sequence_length"]
+
+    prices = generate_sample_prices(base_price_for(symbol), config["samples"], rng)
+    bars = generate_sample_bars(prices, rng)
+
+    X, y = build_training_sequences(prices, bars, sequence_length, config["horizon"], config["threshold"])
+    covered = bars[:len(X) + sequence_length - 1]
+    scaled = scaler.fit_transform(covered)
+
+    X_scaled = sliding_window_view(scaled, (sequence_length, scaled.shape[1]))[:, 0]
+    return X_scaled, y
+
+
+def train_model(model, symbol: str, config: dict, scaler):
+    """Fit a model and its scaler on the symbol's sample training set"""
+    # Sample data stands in for real historical data
+    X_scaled, y = sample_training_set(symbol, config, scaler)
+    model.fit(X_scaled, y, epochs=config["epochs"], batch_size=config["batch_size"], verbose=0)
+    return model